@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:28
+
+from django.db import migrations, models
+
+import core.ids
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0005_profile_created_at_profile_updated_at"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="profile",
+            name="id",
+            field=models.UUIDField(
+                default=core.ids.generate_id,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="id",
+            field=models.UUIDField(
+                default=core.ids.generate_id,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+    ]
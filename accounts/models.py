@@ -1,13 +1,12 @@
-from uuid import uuid4
-
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
+from core.ids import generate_id
 from core.models import AttachableModel, BaseModel
 
 
 class User(AbstractUser):
-    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=generate_id, editable=False)
     joined_at = models.DateField(auto_now_add=True)
 
     def __str__(self):
@@ -1,7 +1,9 @@
 from dj_rest_auth.registration.serializers import SocialLoginSerializer
 from dj_rest_auth.serializers import UserDetailsSerializer
+from django.db.models import Prefetch
 from rest_framework import serializers
 
+from core.models import attachments_prefetch
 from organizations.models import Organization
 from organizations.serializers import SimpleOrganizationSerializer
 
@@ -24,7 +26,8 @@ class ProfileSerializer(serializers.ModelSerializer):
         fields = ["id", "full_name", "phone_number", "profile_picture"]
 
     def get_profile_picture(self, obj):
-        attachment = obj.attachments.first()
+        # Newest attachment, taken from the prefetch cache when there is one
+        attachment = next(iter(obj.attachments.all()), None)
         if attachment and attachment.file:
             return attachment.file.url
         return None
@@ -57,14 +60,29 @@ class CustomUserDetailsSerializer(UserDetailsSerializer):
 
     # True if user is an admin of one or many organizations
     def get_is_org_admin(self, obj):
-        return Organization.objects.filter(admin=obj).exists()
+        return obj.organization_admin.all().exists()
 
     # Returns the organizations where the user is an admin
     def get_organizations(self, obj):
-        organizations = Organization.objects.filter(admin=obj)
+        organizations = obj.organization_admin.all()
         return SimpleOrganizationSerializer(organizations, many=True).data
 
 
+def with_user_details(queryset, lookup=None):
+    """
+    Load everything CustomUserDetailsSerializer renders for the users of
+    `queryset`, or for the users behind `lookup` (e.g. "donor")
+    """
+    prefix = f"{lookup}__" if lookup else ""
+    return queryset.select_related(f"{prefix}profile").prefetch_related(
+        attachments_prefetch(f"{prefix}profile__attachments"),
+        Prefetch(
+            f"{prefix}organization_admin",
+            queryset=Organization.objects.with_attachments(),
+        ),
+    )
+
+
 # Simple User Serializer
 class SimpleUserSerializer(serializers.ModelSerializer):
     profile = SimpleProfileSerializer(read_only=True)
@@ -72,3 +90,12 @@ class SimpleUserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ["id", "username", "email", "profile"]
+
+
+# Public view of a user (e.g. on leaderboards), without contact details
+class PublicUserSerializer(serializers.ModelSerializer):
+    profile = SimpleProfileSerializer(read_only=True)
+
+    class Meta:
+        model = User
+        fields = ["id", "username", "profile"]
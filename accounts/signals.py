@@ -1,6 +1,8 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
+from core.middlewares import revoke_cached_user
+
 from .models import Profile, User
 
 
@@ -8,3 +10,15 @@ from .models import Profile, User
 def create_user_profile(sender, instance, created, **kwargs):
     if created and not (instance.is_staff or instance.is_superuser):
         Profile.objects.create(user=instance)
+
+
+# Deactivated or deleted users must not keep authenticating WebSockets from cache
+@receiver(post_save, sender=User)
+def evict_inactive_user(sender, instance, **kwargs):
+    if not instance.is_active:
+        revoke_cached_user(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def evict_deleted_user(sender, instance, **kwargs):
+    revoke_cached_user(instance.pk)
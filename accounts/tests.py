@@ -1 +1,22 @@
-# Create your tests here.
+from django.test import TestCase
+
+from core.testing import assertMaxQueries
+
+from .models import User
+from .views import UserViewSet
+
+
+class UserQueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="donor", email="donor@example.com")
+        for username in ["first", "second", "third"]:
+            User.objects.create(username=username)
+
+    def test_actions_stay_within_their_budget(self):
+        for action in ["list", "current_user"]:
+            with self.subTest(action):
+                response = assertMaxQueries(
+                    UserViewSet.as_view({"get": action}), user=self.user
+                )
+                self.assertEqual(response.status_code, 200)
@@ -9,12 +9,14 @@ from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
 from attachments.models import Attachment
+from core.views import QueryBudgetMixin, ReplicaReadMixin
 
 from .models import Profile, User
 from .serializers import (
     CustomUserDetailsSerializer,
     GoogleLoginSerializer,
     ProfileSerializer,
+    with_user_details,
 )
 
 
@@ -24,13 +26,14 @@ class GoogleLogin(SocialLoginView):
     serializer_class = GoogleLoginSerializer
 
 
-class UserViewSet(ModelViewSet):
-    queryset = User.objects.all()
+class UserViewSet(QueryBudgetMixin, ReplicaReadMixin, ModelViewSet):
+    queryset = with_user_details(User.objects.all())
     serializer_class = CustomUserDetailsSerializer
     http_method_names = ["get", "put"]
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ["is_staff"]
+    query_budget = {"list": 8, "current_user": 9}
 
     def update(self, request, *args, **kwargs):
         return Response(
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("activities", "0001_initial"),
+        ("organizations", "0003_organization_kpay_qr_image_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="activity",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="activities__created_07f32c_idx"
+            ),
+        ),
+    ]
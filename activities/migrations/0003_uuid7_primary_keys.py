@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:28
+
+from django.db import migrations, models
+
+import core.ids
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("activities", "0002_activity_activities__created_07f32c_idx"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="activity",
+            name="id",
+            field=models.UUIDField(
+                default=core.ids.generate_id,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="activitytransaction",
+            name="id",
+            field=models.UUIDField(
+                default=core.ids.generate_id,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+    ]
@@ -1,12 +1,46 @@
 from django.contrib.contenttypes.fields import GenericRelation
 from django.db import models
+from django.db.models import Prefetch
 
-from attachments.models import Attachment
-from core.models import AttachableModel, BaseModel
+from core.models import (
+    AttachableModel,
+    AttachableQuerySet,
+    BaseModel,
+    attachments_prefetch,
+)
 from organizations.models import Organization
 from transactions.models import Transaction
 
 
+class ActivityQuerySet(AttachableQuerySet):
+    def with_transactions(self, compact=False):
+        """
+        Load a page of activities with everything their serializers render, in a
+        constant number of queries. `compact` only loads the bare transactions
+        used by the list representation.
+        """
+        links = ActivityTransaction.objects.select_related("transaction")
+        lookups = []
+        if not compact:
+            links = links.select_related(
+                "transaction__organization",
+                "transaction__actor__profile",
+                "transaction__event",
+            )
+            lookups = [
+                attachments_prefetch("transaction_links__transaction__attachments"),
+                attachments_prefetch(
+                    "transaction_links__transaction__organization__attachments"
+                ),
+            ]
+
+        return (
+            self.select_related("organization")
+            .with_attachments("organization")
+            .prefetch_related(Prefetch("transaction_links", queryset=links), *lookups)
+        )
+
+
 class Activity(BaseModel, AttachableModel):
     organization = models.ForeignKey(
         Organization, on_delete=models.CASCADE, related_name="activities"
@@ -17,10 +51,15 @@ class Activity(BaseModel, AttachableModel):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ActivityQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Activity"
         verbose_name_plural = "Activities"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["-created_at", "-id"]),
+        ]
 
     def __str__(self):
         return self.title
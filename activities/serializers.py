@@ -9,7 +9,10 @@ from attachments.serializers import SimpleAttachmentSerializer
 from organizations.models import Organization
 from organizations.serializers import SimpleOrganizationSerializer
 from transactions.models import Transaction
-from transactions.serializers import TransactionSerializer
+from transactions.serializers import (
+    SimpleTransactionSerializer,
+    TransactionSerializer,
+)
 
 from .models import Activity, ActivityTransaction
 
@@ -23,6 +26,15 @@ class ActivityTransactionSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class CompactActivityTransactionSerializer(serializers.ModelSerializer):
+    transaction = SimpleTransactionSerializer(read_only=True)
+
+    class Meta:
+        model = ActivityTransaction
+        fields = ["id", "transaction", "linked_at"]
+        read_only_fields = fields
+
+
 class ActivityDetailSerializer(serializers.ModelSerializer):
     organization = SimpleOrganizationSerializer(read_only=True)
     activity_transactions = ActivityTransactionSerializer(
@@ -208,3 +220,10 @@ class ActivityDetailSerializer(serializers.ModelSerializer):
                     ActivityTransaction.objects.bulk_create(activity_transactions)
 
             return instance
+
+
+# List pages only render the bare linked transactions
+class ActivityListSerializer(ActivityDetailSerializer):
+    activity_transactions = CompactActivityTransactionSerializer(
+        source="transaction_links", many=True, read_only=True
+    )
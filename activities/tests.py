@@ -1 +1,71 @@
-# Create your tests here.
+from decimal import Decimal
+
+from django.test import TestCase
+
+from accounts.models import User
+from core.testing import assertMaxQueries
+from organizations.models import Organization, OrganizationRequest
+from transactions.constants import TransactionStatus, TransactionType
+from transactions.models import Transaction
+
+from .models import Activity, ActivityTransaction
+from .views import ActivityListViewSet, ActivityViewSet
+
+
+class ActivityQueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create(username="admin")
+        request = OrganizationRequest.objects.create(
+            submitted_by=cls.admin, organization_name="Relief", type="ngo"
+        )
+        cls.organization = Organization.objects.create(
+            admin=cls.admin, name="Relief", type="ngo", organization_request=request
+        )
+        for title in ["Food", "Tents", "Water"]:
+            activity = Activity.objects.create(
+                organization=cls.organization, title=title, location="Yangon"
+            )
+            for _ in range(2):
+                transaction = Transaction.objects.create(
+                    organization=cls.organization,
+                    actor=cls.admin,
+                    amount=Decimal("10.00"),
+                    type=TransactionType.DISBURSEMENT,
+                    status=TransactionStatus.APPROVED,
+                )
+                ActivityTransaction.objects.create(
+                    activity=activity, transaction=transaction
+                )
+        cls.activity = activity
+
+    def assert_within_budget(
+        self, view_class, actions, method="get", status=200, **kwargs
+    ):
+        with self.subTest(view=view_class.__name__, action=actions[method]):
+            response = assertMaxQueries(
+                view_class.as_view(actions), method=method, user=self.admin, **kwargs
+            )
+            self.assertEqual(response.status_code, status)
+
+    def test_organization_activities_stay_within_their_budget(self):
+        kwargs = {"organization_pk": self.organization.pk}
+
+        self.assert_within_budget(ActivityViewSet, {"get": "list"}, **kwargs)
+        self.assert_within_budget(
+            ActivityViewSet, {"get": "retrieve"}, pk=self.activity.pk, **kwargs
+        )
+        self.assert_within_budget(
+            ActivityViewSet,
+            {"delete": "destroy"},
+            method="delete",
+            status=204,
+            pk=self.activity.pk,
+            **kwargs,
+        )
+
+    def test_activities_stay_within_their_budget(self):
+        self.assert_within_budget(ActivityListViewSet, {"get": "list"})
+        self.assert_within_budget(
+            ActivityListViewSet, {"get": "retrieve"}, pk=self.activity.pk
+        )
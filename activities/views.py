@@ -1,23 +1,25 @@
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework import viewsets
-from rest_framework.filters import SearchFilter
 from rest_framework.permissions import IsAuthenticated
 
 from activities.models import Activity
+from core.views import QueryBudgetMixin, ReplicaReadMixin
 from organizations.models import Organization
+from search.filters import IndexedSearchFilter
 
 from .permissions import IsOrgAdmin
-from .serializers import ActivityDetailSerializer
+from .serializers import ActivityDetailSerializer, ActivityListSerializer
 
 
-class ActivityViewSet(viewsets.ModelViewSet):
-    queryset = Activity.objects.all()
+class ActivityViewSet(QueryBudgetMixin, ReplicaReadMixin, viewsets.ModelViewSet):
+    queryset = Activity.objects.with_transactions()
     serializer_class = ActivityDetailSerializer
     permission_classes = [IsAuthenticated, IsOrgAdmin]
-    filter_backends = [SearchFilter]
+    filter_backends = [IndexedSearchFilter]
     search_fields = ["title"]
     http_method_names = ["get", "post", "delete", "patch"]
+    query_budget = {"list": 9, "retrieve": 12, "default": 15}
 
     def get_permissions(self):
         if self.action == "list":
@@ -26,11 +28,16 @@ class ActivityViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         if self.action == "list":
-            return Activity.objects.filter(
+            return Activity.objects.with_transactions(compact=True).filter(
                 organization=self.kwargs.get("organization_pk")
             )
         return super().get_queryset()
 
+    def get_serializer_class(self):
+        if self.action == "list":
+            return ActivityListSerializer
+        return super().get_serializer_class()
+
     def get_serializer_context(self):
         context = super().get_serializer_context()
 
@@ -44,10 +51,21 @@ class ActivityViewSet(viewsets.ModelViewSet):
         serializer.save(organization=self.organization)
 
 
-class ActivityListViewSet(viewsets.ModelViewSet):
-    queryset = Activity.objects.all()
+class ActivityListViewSet(QueryBudgetMixin, ReplicaReadMixin, viewsets.ModelViewSet):
+    queryset = Activity.objects.with_transactions()
     serializer_class = ActivityDetailSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [SearchFilter]
+    filter_backends = [IndexedSearchFilter]
     search_fields = ["title"]
     http_method_names = ["get"]
+    query_budget = {"list": 7, "retrieve": 8}
+
+    def get_queryset(self):
+        if self.action == "list":
+            return Activity.objects.with_transactions(compact=True)
+        return super().get_queryset()
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return ActivityListSerializer
+        return super().get_serializer_class()
@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from .models import Attachment
+from .models import Attachment, AttachmentFile
 
 # Register your models here.
 admin.site.register(Attachment)
+admin.site.register(AttachmentFile)
@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from attachments.models import Attachment, AttachmentFile
+
+ATTACHMENTS_DIR = "attachments"
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete attachment files (originals and variants) that no attachment "
+        "references anymore."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace-minutes",
+            type=int,
+            default=60,
+            help="Keep files used more recently than this, their attachment may not be saved yet.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the files that would be deleted, without writing anything.",
+        )
+
+    def handle(self, *args, **options):
+        referenced = self.get_referenced_names()
+        cutoff = timezone.now() - timedelta(minutes=options["grace_minutes"])
+
+        deleted = kept = 0
+        for name in self.walk(ATTACHMENTS_DIR):
+            if name in referenced:
+                continue
+
+            # Only reports, without recording, locking or deleting anything
+            if options["dry_run"]:
+                if self.get_last_used_at(name) > cutoff:
+                    kept += 1
+                else:
+                    deleted += 1
+                    self.stdout.write(f"  would delete {name}")
+                continue
+
+            # Files stored before uses were recorded go by their age. Waits on
+            # an upload that is inserting the same row in an open transaction
+            AttachmentFile.objects.bulk_create(
+                [
+                    AttachmentFile(
+                        name=name,
+                        last_used_at=default_storage.get_modified_time(name),
+                    )
+                ],
+                ignore_conflicts=True,
+            )
+
+            # Locked, so an upload that reuses the file in a transaction that
+            # is still open makes this wait and then see the new use
+            with transaction.atomic():
+                record = (
+                    AttachmentFile.objects.select_for_update().filter(name=name).first()
+                )
+                if record is None or record.last_used_at > cutoff:
+                    kept += 1
+                    continue
+
+                if Attachment.objects.filter(file=name).exists():
+                    continue
+
+                deleted += 1
+                default_storage.delete(name)
+                record.delete()
+
+        verb = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ {verb} {deleted} unreferenced files, "
+                f"kept {kept} inside the grace period"
+            )
+        )
+
+    def get_referenced_names(self):
+        referenced = set()
+        for name, variants in Attachment.objects.values_list(
+            "file", "variants"
+        ).iterator():
+            referenced.add(name)
+            referenced.update((variants or {}).values())
+
+        return referenced
+
+    def get_last_used_at(self, name):
+        record = AttachmentFile.objects.filter(name=name).first()
+        if record is not None:
+            return record.last_used_at
+
+        return default_storage.get_modified_time(name)
+
+    def walk(self, path):
+        if not default_storage.exists(path):
+            return
+
+        directories, files = default_storage.listdir(path)
+        for name in files:
+            yield f"{path}/{name}"
+        for directory in directories:
+            yield from self.walk(f"{path}/{directory}")
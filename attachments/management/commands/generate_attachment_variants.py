@@ -0,0 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from attachments.models import Attachment
+from attachments.variants import run_variant_job
+
+
+class Command(BaseCommand):
+    help = "Generate the resized variants of attachments that have none yet."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Regenerate every attachment, e.g. after changing the widths.",
+        )
+        parser.add_argument(
+            "--workers", type=int, default=settings.ATTACHMENT_VARIANT_WORKERS
+        )
+
+    def handle(self, *args, **options):
+        attachments = Attachment.objects.all()
+        if not options["all"]:
+            attachments = attachments.filter(variants__isnull=True)
+
+        attachment_ids = list(attachments.values_list("id", flat=True))
+        self.stdout.write(
+            self.style.NOTICE(f"Processing {len(attachment_ids)} attachments...")
+        )
+
+        with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+            for done, _ in enumerate(
+                executor.map(
+                    partial(run_variant_job, force=options["all"]), attachment_ids
+                ),
+                start=1,
+            ):
+                if done % 100 == 0:
+                    self.stdout.write(f"  {done}/{len(attachment_ids)}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Variants generated for {len(attachment_ids)} attachments"
+            )
+        )
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("attachments", "0002_attachment_attachments_content_44d952_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="attachment",
+            name="variants",
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
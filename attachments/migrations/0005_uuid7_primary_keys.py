@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:28
+
+from django.db import migrations, models
+
+import core.ids
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("attachments", "0004_attachment_content_hash"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="attachment",
+            name="id",
+            field=models.UUIDField(
+                default=core.ids.generate_id,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+    ]
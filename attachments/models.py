@@ -1,10 +1,16 @@
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
-from django.db import models
+from django.db import models, transaction
+from django_cleanup import cleanup
 
 from core.models import BaseModel
 
+from .storage import store_content_addressed
 
+
+# Files can be shared by several attachments, so they are removed by the
+# collect_attachment_files command instead of on delete
+@cleanup.ignore
 class Attachment(BaseModel):
     # ContentType is a model that allows you to link to any model
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
@@ -14,14 +20,48 @@ class Attachment(BaseModel):
     # not actually a table field, it's a virtual field
     content_object = GenericForeignKey("content_type", "object_id")
     file = models.FileField(upload_to="attachments")
+    # Resized copies of image files by width, e.g. {"320w": "attachments/variants/..."}.
+    # Null until the variant pipeline has processed the file
+    variants = models.JSONField(null=True, blank=True)
+    # SHA-256 of the file, null for files uploaded before content addressing
+    content_hash = models.CharField(max_length=64, null=True, blank=True)
 
     def __str__(self):
         return f"{self.file.name} - {self.content_object}"
 
+    def save(self, *args, **kwargs):
+        # The file's use is recorded in the same transaction as the row that
+        # references it, see AttachmentFile
+        with transaction.atomic():
+            if self.file and not self.file._committed:
+                self.file, self.content_hash = store_content_addressed(self.file)
+            super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = "Attachment"
         verbose_name_plural = "Attachments"
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["content_type", "object_id"]),
+            models.Index(fields=["content_hash"]),
         ]
+
+
+class AttachmentFile(models.Model):
+    """
+    Last time a stored file (original or variant) was put to use. Files are
+    shared by content, so a new attachment can point at a file that no
+    committed attachment references. Every use updates this row first, and
+    collect_attachment_files locks it before deleting, so a file in use by a
+    transaction that is still open, or used within the grace period, is kept.
+    """
+
+    name = models.CharField(max_length=255, unique=True)
+    last_used_at = models.DateTimeField()
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        verbose_name = "Attachment File"
+        verbose_name_plural = "Attachment Files"
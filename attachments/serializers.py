@@ -4,9 +4,21 @@ from .models import Attachment
 
 
 class SimpleAttachmentSerializer(serializers.ModelSerializer):
+    # Resized variants by width, e.g. {"320w": url, "640w": url}
+    srcset = serializers.SerializerMethodField(read_only=True)
+
     class Meta:
         model = Attachment
-        fields = ["id", "file"]
+        fields = ["id", "file", "srcset"]
+
+    def get_srcset(self, obj):
+        request = self.context.get("request")
+        srcset = {}
+        for width, name in (obj.variants or {}).items():
+            url = obj.file.storage.url(name)
+            srcset[width] = request.build_absolute_uri(url) if request else url
+
+        return srcset
 
 
 class AttachmentSerializer(serializers.ModelSerializer):
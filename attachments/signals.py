@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Attachment
+from .variants import schedule_variants
+
+
+@receiver(post_save, sender=Attachment)
+def generate_attachment_variants(sender, instance, created, **kwargs):
+    if created:
+        schedule_variants(instance.pk)
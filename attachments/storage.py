@@ -0,0 +1,55 @@
+import hashlib
+import os
+
+from django.utils import timezone
+
+# Uploads are stored once per content, under the SHA-256 of their bytes
+CONTENT_PREFIX = "attachments/sha256"
+
+
+def get_content_name(content_hash, filename):
+    extension = os.path.splitext(filename)[1].lower()
+    return f"{CONTENT_PREFIX}/{content_hash[:2]}/{content_hash}{extension}"
+
+
+def hash_file(file):
+    # Chunked, so large uploads are never held in memory as a whole
+    hasher = hashlib.sha256()
+    for chunk in file.chunks():
+        hasher.update(chunk)
+    file.seek(0)
+    return hasher.hexdigest()
+
+
+def touch_files(names):
+    """
+    Record that the stored files `names` are in use now. Inside a transaction
+    the rows stay locked until it ends, which holds off the collector.
+    """
+    from .models import AttachmentFile
+
+    now = timezone.now()
+    AttachmentFile.objects.bulk_create(
+        [AttachmentFile(name=name, last_used_at=now) for name in names],
+        update_conflicts=True,
+        unique_fields=["name"],
+        update_fields=["last_used_at"],
+    )
+
+
+def store_content_addressed(field_file):
+    """
+    Store an uncommitted upload under its content key and return the stored
+    name and the hash. Content that is already stored is not written again.
+    """
+    content_hash = hash_file(field_file.file)
+    name = get_content_name(content_hash, field_file.name)
+    storage = field_file.storage
+
+    # Before the existence check, so the collector cannot delete the file
+    # between the check and the reference to it
+    touch_files([name])
+    if not storage.exists(name):
+        name = storage.save(name, field_file.file)
+
+    return name, content_hash
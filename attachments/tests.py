@@ -1 +1,131 @@
-# Create your tests here.
+import io
+import os
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+
+from accounts.models import User
+
+from .models import Attachment, AttachmentFile
+from .variants import generate_variants
+
+
+def png_file(width=800, height=600, name="photo.png"):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), "orange").save(buffer, format="PNG")
+    return ContentFile(buffer.getvalue(), name=name)
+
+
+class AttachmentFileTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create(username="owner")
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def attach(self, file):
+        return Attachment.objects.create(content_object=self.owner, file=file)
+
+    def collect(self, *args):
+        output = io.StringIO()
+        call_command("collect_attachment_files", *args, stdout=output)
+        return output.getvalue()
+
+    def backdate(self, name, hours=2):
+        AttachmentFile.objects.filter(name=name).update(
+            last_used_at=timezone.now() - timedelta(hours=hours)
+        )
+
+    def test_reused_content_is_marked_as_used(self):
+        name = self.attach(ContentFile(b"receipt", name="a.pdf")).file.name
+        self.backdate(name)
+
+        self.attach(ContentFile(b"receipt", name="b.pdf"))
+
+        record = AttachmentFile.objects.get(name=name)
+        self.assertGreater(record.last_used_at, timezone.now() - timedelta(minutes=1))
+
+    def test_recently_used_files_survive_collection(self):
+        attachment = self.attach(ContentFile(b"receipt", name="a.pdf"))
+        name = attachment.file.name
+        attachment.delete()
+
+        self.collect()
+
+        self.assertTrue(default_storage.exists(name))
+
+    def test_unused_files_are_collected_after_the_grace_period(self):
+        attachment = self.attach(ContentFile(b"receipt", name="a.pdf"))
+        name = attachment.file.name
+        attachment.delete()
+        self.backdate(name)
+
+        self.collect()
+
+        self.assertFalse(default_storage.exists(name))
+        self.assertFalse(AttachmentFile.objects.filter(name=name).exists())
+
+    def test_referenced_files_are_kept(self):
+        name = self.attach(ContentFile(b"receipt", name="a.pdf")).file.name
+        self.backdate(name)
+
+        self.collect()
+
+        self.assertTrue(default_storage.exists(name))
+
+    def test_files_without_a_record_go_by_their_age(self):
+        name = default_storage.save("attachments/legacy.pdf", ContentFile(b"old"))
+        old = time.time() - 2 * 3600
+        os.utime(default_storage.path(name), (old, old))
+
+        self.collect()
+
+        self.assertFalse(default_storage.exists(name))
+
+    def test_dry_run_writes_nothing(self):
+        attachment = self.attach(ContentFile(b"receipt", name="a.pdf"))
+        name = attachment.file.name
+        attachment.delete()
+        self.backdate(name)
+        legacy = default_storage.save("attachments/legacy.pdf", ContentFile(b"old"))
+        old = time.time() - 2 * 3600
+        os.utime(default_storage.path(legacy), (old, old))
+        records = list(AttachmentFile.objects.values_list("name", "last_used_at"))
+
+        output = self.collect("--dry-run")
+
+        self.assertIn(f"would delete {name}", output)
+        self.assertIn(f"would delete {legacy}", output)
+        self.assertTrue(default_storage.exists(name))
+        self.assertTrue(default_storage.exists(legacy))
+        self.assertEqual(
+            list(AttachmentFile.objects.values_list("name", "last_used_at")), records
+        )
+
+    def test_shared_variants_are_never_rewritten(self):
+        first = self.attach(png_file())
+        variants = generate_variants(first.pk)
+        self.assertTrue(variants)
+        modified = {
+            name: default_storage.get_modified_time(name) for name in variants.values()
+        }
+
+        second = self.attach(png_file(name="copy.png"))
+        self.assertEqual(generate_variants(second.pk, force=True), variants)
+        for name, modified_time in modified.items():
+            self.assertEqual(default_storage.get_modified_time(name), modified_time)
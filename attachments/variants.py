@@ -0,0 +1,130 @@
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .models import Attachment
+from .storage import touch_files
+
+logger = logging.getLogger(__name__)
+
+VARIANT_EXTENSIONS = {"WEBP": "webp", "JPEG": "jpg"}
+
+# Resizing happens in Pillow's C code, which releases the GIL, so threads are enough
+variant_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, "ATTACHMENT_VARIANT_WORKERS", 2),
+    thread_name_prefix="attachment-variants",
+)
+
+
+def get_variant_name(key, width, image_format):
+    return f"attachments/variants/{key}/{width}.{VARIANT_EXTENSIONS[image_format]}"
+
+
+def render_variant(image, width, image_format, quality):
+    variant = image.copy()
+    variant.thumbnail((width, variant.height), Image.Resampling.LANCZOS)
+
+    if image_format == "JPEG" or variant.mode not in ("RGB", "RGBA"):
+        has_alpha = (
+            variant.mode in ("RGBA", "LA", "PA") or "transparency" in variant.info
+        )
+        variant = variant.convert(
+            "RGBA" if has_alpha and image_format != "JPEG" else "RGB"
+        )
+
+    buffer = io.BytesIO()
+    variant.save(buffer, format=image_format, quality=quality)
+    return buffer.getvalue()
+
+
+def generate_variants(attachment_id, force=False):
+    """
+    Write the resized variants of an attachment's image and store their names
+    on it. Files that are not images get an empty map. Variants of content
+    that was already processed are reused unless `force` is set, in which
+    case only missing variant files are rendered: they are shared by every
+    attachment of the same content, so they are never rewritten.
+    """
+    attachment = (
+        Attachment.objects.filter(pk=attachment_id)
+        .only("id", "file", "content_hash")
+        .first()
+    )
+    if attachment is None or not attachment.file:
+        return None
+
+    if attachment.content_hash and not force:
+        variants = (
+            Attachment.objects.filter(
+                content_hash=attachment.content_hash, variants__isnull=False
+            )
+            .values_list("variants", flat=True)
+            .first()
+        )
+        if variants is not None:
+            with transaction.atomic():
+                touch_files(variants.values())
+                Attachment.objects.filter(pk=attachment_id).update(variants=variants)
+            return variants
+
+    widths = sorted(set(getattr(settings, "ATTACHMENT_VARIANT_WIDTHS", [])))
+    image_format = getattr(settings, "ATTACHMENT_VARIANT_FORMAT", "WEBP")
+    quality = getattr(settings, "ATTACHMENT_VARIANT_QUALITY", 80)
+    storage = attachment.file.storage
+
+    variants = {}
+    try:
+        with attachment.file.open("rb") as source, Image.open(source) as image:
+            image = ImageOps.exif_transpose(image)
+
+            # Only downscale, images smaller than a width are served as they are
+            names = {
+                width: get_variant_name(
+                    attachment.content_hash or attachment.pk, width, image_format
+                )
+                for width in widths
+                if width < image.width
+            }
+            # Marked as used before they are written, so the collector's grace
+            # period covers them until the attachment references them
+            touch_files(names.values())
+
+            for width, name in names.items():
+                if not storage.exists(name):
+                    name = storage.save(
+                        name,
+                        ContentFile(
+                            render_variant(image, width, image_format, quality)
+                        ),
+                    )
+                variants[f"{width}w"] = name
+    except (UnidentifiedImageError, Image.DecompressionBombError):
+        pass
+
+    # Files left behind by deleted attachments go with collect_attachment_files
+    with transaction.atomic():
+        touch_files(variants.values())
+        Attachment.objects.filter(pk=attachment_id).update(variants=variants)
+    return variants
+
+
+def run_variant_job(attachment_id, force=False):
+    try:
+        generate_variants(attachment_id, force=force)
+    except Exception:
+        logger.exception("Could not generate variants of attachment %s", attachment_id)
+    finally:
+        # Worker threads have their own connections, don't leave them open
+        connections.close_all()
+
+
+def schedule_variants(attachment_id):
+    # The upload must be committed before a worker can read it
+    transaction.on_commit(
+        lambda: variant_executor.submit(run_variant_job, attachment_id)
+    )
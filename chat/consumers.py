@@ -1,5 +1,4 @@
 import json
-from datetime import datetime
 
 from channels.consumer import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
@@ -17,58 +16,105 @@ class ChatConsumer(AsyncWebsocketConsumer):
         self.room_name = self.scope["url_route"]["kwargs"]["room_name"]
         self.room_group_name = f"chat_{self.room_name}"
 
+        # Membership is resolved once per connection instead of once per message
+        self.chat = await self.get_chat()
+        if self.chat is None:
+            await self.close(code=403)
+            return
+
         # join the group
         await self.channel_layer.group_add(self.room_group_name, self.channel_name)
 
         await self.accept()
 
     async def disconnect(self, close_code):
+        from .writers import message_writer
+
+        if not hasattr(self, "chat") or self.chat is None:
+            return
+
         # leave the group
         await self.channel_layer.group_discard(self.room_group_name, self.channel_name)
+        await message_writer.flush()
+
+    @database_sync_to_async
+    def get_chat(self):
+        from django.core.exceptions import ValidationError
+
+        from .models import Chat
+
+        try:
+            chat = (
+                Chat.objects.select_related("organization")
+                .only("id", "donor_id", "organization_id", "organization__admin_id")
+                .get(id=self.room_name)
+            )
+        except (Chat.DoesNotExist, ValidationError):
+            return None
 
-    async def save_message(self, sender_id, sender_type, room_name, message):
-        from accounts.models import User
-        from organizations.models import Organization
+        if self.user.pk not in (chat.donor_id, chat.organization.admin_id):
+            return None
 
+        return chat
+
+    def get_sender(self, sender_type):
+        """
+        Resolve the sender from the authenticated user and the cached chat,
+        the client only chooses which of its roles it is speaking as.
+        """
         from .constants import SenderType
-        from .models import Chat, ChatMessage
 
-        chat = await database_sync_to_async(Chat.objects.get)(id=room_name)
+        if (
+            sender_type == SenderType.ORGANIZATION
+            and self.user.pk == self.chat.organization.admin_id
+        ):
+            return SenderType.ORGANIZATION, self.chat.organization_id
+
+        if self.user.pk == self.chat.donor_id:
+            return SenderType.DONOR, self.user.pk
 
-        if sender_type == SenderType.ORGANIZATION:
-            organization = await database_sync_to_async(Organization.objects.get)(
-                id=sender_id
+        return SenderType.ORGANIZATION, self.chat.organization_id
+
+    async def save_message(self, sender_type, message):
+        from .constants import SenderType
+        from .models import ChatMessage
+        from .writers import message_writer
+
+        await message_writer.write(
+            ChatMessage(
+                chat_id=self.chat.pk,
+                sender=sender_type,
+                donor_id=self.user.pk if sender_type == SenderType.DONOR else None,
+                organization_id=(
+                    self.chat.organization_id
+                    if sender_type == SenderType.ORGANIZATION
+                    else None
+                ),
+                content=message,
             )
-            donor = None
-        else:
-            donor = await database_sync_to_async(User.objects.get)(id=sender_id)
-            organization = None
-
-        await database_sync_to_async(ChatMessage.objects.create)(
-            chat=chat,
-            sender=sender_type,
-            donor=donor,
-            organization=organization,
-            content=message,
         )
 
     async def receive(self, text_data):
+        from .writers import DurabilityMode, message_writer
+
         data = json.loads(text_data)
         message = data["message"]
-        sender_type = data["sender_type"]
-        sender_id = data["sender_id"]
-
-        await self.save_message(sender_id, sender_type, self.room_name, message)
-
-        await self.channel_layer.group_send(
-            self.room_group_name,
-            {
-                "type": "chat_message",
-                "message": message,
-                "sender_type": sender_type,
-                "sender_id": sender_id,
-            },
-        )
+        sender_type, sender_id = self.get_sender(data.get("sender_type"))
+        event = {
+            "type": "chat_message",
+            "message": message,
+            "sender_type": sender_type,
+            "sender_id": str(sender_id),
+        }
+
+        # Write-through messages are only broadcast once they are saved
+        if message_writer.durability == DurabilityMode.WRITE_THROUGH:
+            await self.save_message(sender_type, message)
+            await self.channel_layer.group_send(self.room_group_name, event)
+            return
+
+        await self.channel_layer.group_send(self.room_group_name, event)
+        await self.save_message(sender_type, message)
 
     async def chat_message(self, event):
         message = event["message"]
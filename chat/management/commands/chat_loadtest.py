@@ -0,0 +1,85 @@
+import asyncio
+import time
+
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.core.management.base import BaseCommand, CommandError
+
+from chat.models import Chat, ChatMessage
+from chat.routing import websocket_urlpatterns
+from chat.writers import DurabilityMode, message_writer
+
+
+class Command(BaseCommand):
+    help = "Push messages through ChatConsumer and report messages/sec for a durability mode."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chat", help="Chat id to post into (defaults to the first chat)."
+        )
+        parser.add_argument("--messages", type=int, default=1000)
+        parser.add_argument("--clients", type=int, default=1)
+        parser.add_argument(
+            "--durability",
+            choices=[DurabilityMode.WRITE_THROUGH, DurabilityMode.WRITE_BEHIND],
+            default=message_writer.durability,
+        )
+
+    def handle(self, *args, **options):
+        chats = Chat.objects.select_related("donor")
+        chat = (
+            chats.filter(pk=options["chat"]).first()
+            if options["chat"]
+            else chats.first()
+        )
+        if chat is None:
+            raise CommandError("No chat found, create one first.")
+
+        message_writer.durability = options["durability"]
+        before = ChatMessage.objects.filter(chat=chat).count()
+
+        elapsed = asyncio.run(self.run(chat, options["clients"], options["messages"]))
+
+        saved = ChatMessage.objects.filter(chat=chat).count() - before
+        total = options["clients"] * options["messages"]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ {options['durability']}: {total} messages in {elapsed:.2f}s "
+                f"({total / elapsed:.0f} msg/s), {saved} saved"
+            )
+        )
+
+    async def run(self, chat, clients, messages):
+        async def application(scope, receive, send):
+            scope["user"] = chat.donor
+            return await URLRouter(websocket_urlpatterns)(scope, receive, send)
+
+        communicators = [
+            WebsocketCommunicator(application, f"/ws/chat/{chat.pk}/")
+            for _ in range(clients)
+        ]
+        for communicator in communicators:
+            connected, _ = await communicator.connect()
+            if not connected:
+                raise CommandError("Could not connect to the chat consumer.")
+
+        async def send_all(communicator):
+            for index in range(messages):
+                await communicator.send_json_to(
+                    {"message": f"load test {index}", "sender_type": "donor"}
+                )
+                # Every client receives every broadcast of the room
+                for _ in range(clients):
+                    await communicator.receive_json_from(timeout=10)
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(send_all(communicator) for communicator in communicators)
+        )
+        await message_writer.flush()
+        elapsed = time.perf_counter() - started
+
+        for communicator in communicators:
+            await communicator.disconnect()
+
+        return elapsed
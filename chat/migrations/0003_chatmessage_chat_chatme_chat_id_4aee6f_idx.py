@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("chat", "0002_chatmessage_donor_chatmessage_organization_and_more"),
+        ("organizations", "0003_organization_kpay_qr_image_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="chatmessage",
+            index=models.Index(
+                fields=["chat", "-timestamp", "-id"],
+                name="chat_chatme_chat_id_4aee6f_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:28
+
+from django.db import migrations, models
+
+import core.ids
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("chat", "0003_chatmessage_chat_chatme_chat_id_4aee6f_idx"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="chat",
+            name="id",
+            field=models.UUIDField(
+                default=core.ids.generate_id,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="chatmessage",
+            name="id",
+            field=models.UUIDField(
+                default=core.ids.generate_id,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+    ]
@@ -1,12 +1,12 @@
-from uuid import uuid4
-
 from django.db import models
 
+from core.ids import generate_id
+
 from .constants import SenderType
 
 
 class Chat(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=generate_id, editable=False)
     donor = models.ForeignKey(
         "accounts.User", on_delete=models.CASCADE, related_name="donor_chats"
     )
@@ -22,7 +22,7 @@ class Chat(models.Model):
 
 
 class ChatMessage(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=generate_id, editable=False)
     chat = models.ForeignKey(Chat, on_delete=models.CASCADE, related_name="messages")
     sender = models.CharField(max_length=20, choices=SenderType.choices)
     donor = models.ForeignKey(
@@ -44,13 +44,17 @@ class ChatMessage(models.Model):
 
     class Meta:
         ordering = ["timestamp"]
+        indexes = [
+            # Keyset pages of a chat's message history
+            models.Index(fields=["chat", "-timestamp", "-id"]),
+        ]
 
     def clean(self):
-        if self.sender == SenderType.DONOR and not self.donor:
+        if self.sender == SenderType.DONOR and not self.donor_id:
             raise ValueError("Donor must be set if sender is donor")
-        if self.sender == SenderType.ORGANIZATION and not self.organization:
+        if self.sender == SenderType.ORGANIZATION and not self.organization_id:
             raise ValueError("Organization must be set if sender is organization")
-        if not self.donor and not self.organization:
+        if not self.donor_id and not self.organization_id:
             raise ValueError("At least one of the donor or organization must be set")
 
     def save(self, *args, **kwargs):
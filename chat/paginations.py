@@ -0,0 +1,75 @@
+from collections import OrderedDict
+
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from core.paginations import KeysetPagination
+
+
+class ChatMessagePagination(KeysetPagination):
+    """
+    Message history paged backwards from the newest message. With `?since=`
+    only the messages after that position are returned, oldest first, so a
+    reconnecting client catches up with one indexed range scan.
+
+    Every response carries a `since` token for the newest message the client
+    has now seen.
+    """
+
+    page_size = 50
+    ordering = ("-timestamp", "-id")
+    since_query_param = "since"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        since = request.query_params.get(self.since_query_param)
+        if since is None:
+            results = super().paginate_queryset(queryset, request, view)
+            # Only the page without newer messages holds the newest one
+            self.since = None
+            if results and not self.has_previous:
+                self.since = self.encode_position(self.get_position(results[0]))
+            return results
+
+        self.request = request
+        self.model = queryset.model
+        self.page_size = self.get_page_size(request)
+        position, _ = self.decode_position(since)
+
+        ordering = [self.flip(field) for field in self.ordering]
+        queryset = queryset.order_by(*ordering).filter(
+            self.get_keyset_filter(ordering, position)
+        )
+
+        results = list(queryset[: self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.has_previous = False
+        self.page = results = results[: self.page_size]
+
+        self.since = (
+            self.encode_position(self.get_position(results[-1])) if results else since
+        )
+        return results
+
+    def get_next_link(self):
+        if self.since_query_param not in self.request.query_params:
+            return super().get_next_link()
+
+        if not self.has_next:
+            return None
+
+        url = remove_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param
+        )
+        return replace_query_param(url, self.since_query_param, self.since)
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("since", self.since),
+                    ("results", data),
+                ]
+            )
+        )
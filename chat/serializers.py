@@ -21,6 +21,12 @@ class ChatMessageSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+class ChatHistoryMessageSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ChatMessage
+        fields = ["id", "sender", "donor", "organization", "content", "timestamp"]
+
+
 class UpdateChatMessageSerializer(serializers.ModelSerializer):
     class Meta:
         model = ChatMessage
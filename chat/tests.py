@@ -1 +1,180 @@
-# Create your tests here.
+import json
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from organizations.models import Organization, OrganizationRequest
+
+from .constants import SenderType
+from .consumers import ChatConsumer
+from .models import Chat, ChatMessage
+from .writers import ChatMessageWriter, DurabilityMode, message_writer
+
+
+class SaveError(Exception):
+    pass
+
+
+class ChatMessageWriterTests(SimpleTestCase):
+    def test_failed_batch_is_logged_and_queued_again(self):
+        writer = ChatMessageWriter(
+            DurabilityMode.WRITE_BEHIND, batch_size=2, flush_interval=60
+        )
+        messages = [mock.Mock(), mock.Mock()]
+
+        with (
+            mock.patch.object(writer, "save_messages", side_effect=SaveError("down")),
+            mock.patch.object(writer, "schedule_flush") as schedule_flush,
+            self.assertLogs("chat.writers", level="ERROR"),
+        ):
+            writer.buffer = list(messages)
+            async_to_sync(writer.flush)()
+
+        self.assertEqual(writer.buffer, messages)
+        schedule_flush.assert_called_once()
+
+        with mock.patch.object(writer, "save_messages") as save_messages:
+            async_to_sync(writer.flush)()
+
+        save_messages.assert_called_once_with(messages)
+        self.assertEqual(writer.buffer, [])
+
+    def test_full_buffer_drops_the_oldest_messages(self):
+        writer = ChatMessageWriter(
+            DurabilityMode.WRITE_BEHIND,
+            batch_size=2,
+            flush_interval=60,
+            max_buffer_size=3,
+        )
+        writer.buffer = ["new"]
+
+        with (
+            mock.patch.object(writer, "schedule_flush"),
+            self.assertLogs("chat.writers", level="ERROR"),
+        ):
+            writer.requeue(["old1", "old2", "old3"])
+
+        self.assertEqual(writer.buffer, ["old2", "old3", "new"])
+
+
+class ChatConsumerDurabilityTests(SimpleTestCase):
+    def receive(self, durability):
+        consumer = ChatConsumer()
+        consumer.user = mock.Mock(pk=1)
+        consumer.chat = mock.Mock(donor_id=1, organization_id=2)
+        consumer.room_group_name = "chat_room"
+        calls = []
+        consumer.channel_layer = mock.Mock()
+        consumer.channel_layer.group_send = mock.AsyncMock(
+            side_effect=lambda *args: calls.append("broadcast")
+        )
+        consumer.save_message = mock.AsyncMock(
+            side_effect=lambda *args: calls.append("save")
+        )
+
+        with mock.patch.object(message_writer, "durability", durability):
+            async_to_sync(consumer.receive)(
+                json.dumps({"message": "hi", "sender_type": SenderType.DONOR})
+            )
+        return calls
+
+    def test_write_through_saves_before_broadcasting(self):
+        self.assertEqual(
+            self.receive(DurabilityMode.WRITE_THROUGH), ["save", "broadcast"]
+        )
+
+    def test_write_behind_broadcasts_first(self):
+        self.assertEqual(
+            self.receive(DurabilityMode.WRITE_BEHIND), ["broadcast", "save"]
+        )
+
+    def test_failed_write_through_save_is_not_broadcast(self):
+        consumer_calls = []
+
+        def fail(*args):
+            consumer_calls.append("save")
+            raise SaveError("down")
+
+        consumer = ChatConsumer()
+        consumer.user = mock.Mock(pk=1)
+        consumer.chat = mock.Mock(donor_id=1, organization_id=2)
+        consumer.room_group_name = "chat_room"
+        consumer.channel_layer = mock.Mock(group_send=mock.AsyncMock())
+        consumer.save_message = mock.AsyncMock(side_effect=fail)
+
+        with (
+            mock.patch.object(
+                message_writer, "durability", DurabilityMode.WRITE_THROUGH
+            ),
+            self.assertRaises(SaveError),
+        ):
+            async_to_sync(consumer.receive)(json.dumps({"message": "hi"}))
+
+        consumer.channel_layer.group_send.assert_not_called()
+
+
+class ChatHistoryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        admin = User.objects.create(username="admin")
+        request = OrganizationRequest.objects.create(
+            submitted_by=admin, organization_name="Relief", type="ngo"
+        )
+        organization = Organization.objects.create(
+            admin=admin, name="Relief", type="ngo", organization_request=request
+        )
+        cls.donor = User.objects.create(username="donor")
+        cls.chat = Chat.objects.create(donor=cls.donor, organization=organization)
+        for content in ["first", "second"]:
+            cls.send(content)
+        cls.url = f"/api/chats/{cls.chat.pk}/messages/"
+
+    @classmethod
+    def send(cls, content):
+        return ChatMessage.objects.create(
+            chat=cls.chat, sender=SenderType.DONOR, donor=cls.donor, content=content
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.donor)
+
+    def test_history_is_newest_first(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [message["content"] for message in response.data["results"]],
+            ["second", "first"],
+        )
+        self.assertIsNotNone(response.data["since"])
+
+    def test_since_returns_only_newer_messages(self):
+        since = self.client.get(self.url).data["since"]
+        self.send("third")
+        self.send("fourth")
+
+        response = self.client.get(self.url, {"since": since})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [message["content"] for message in response.data["results"]],
+            ["third", "fourth"],
+        )
+        self.assertNotEqual(response.data["since"], since)
+
+    def test_bad_since_token_is_not_found(self):
+        for since in ["not-a-token", "eyJwIjpbIngiLCJ5Il19"]:
+            with self.subTest(since=since):
+                response = self.client.get(self.url, {"since": since})
+                self.assertEqual(response.status_code, 404)
+
+    def test_other_users_cannot_read_the_history(self):
+        self.client.force_authenticate(User.objects.create(username="stranger"))
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 403)
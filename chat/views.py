@@ -1,10 +1,14 @@
-from rest_framework import permissions, status, viewsets
+from rest_framework import permissions, viewsets
 from rest_framework.decorators import action
-from rest_framework.response import Response
+
+from accounts.serializers import with_user_details
+from core.models import attachments_prefetch
 
 from .models import Chat, ChatMessage
+from .paginations import ChatMessagePagination
 from .permissions import IsChatOwner, IsMessageOwner
 from .serializers import (
+    ChatHistoryMessageSerializer,
     ChatMessageSerializer,
     ChatSerializer,
     UpdateChatMessageSerializer,
@@ -23,17 +27,25 @@ class ChatViewSet(viewsets.ModelViewSet):
         return [permissions.IsAuthenticated(), IsChatOwner()]
 
     def get_queryset(self):
+        queryset = with_user_details(
+            Chat.objects.select_related("organization"), "donor"
+        ).prefetch_related(attachments_prefetch("organization__attachments"))
         if self.action == "list":
-            return Chat.objects.filter(donor=self.request.user)
+            return queryset.filter(donor=self.request.user)
 
-        return Chat.objects.all()
+        return queryset
 
-    # To retrieve all the messages of a chat (message history)
+    # To retrieve the messages of a chat (message history), newest page first.
+    # Reconnecting clients pass ?since=<token> to only fetch what they missed
     @action(detail=True, methods=["get"], url_path="messages")
     def get_messages(self, request, pk=None):
-        messages = ChatMessage.objects.filter(chat=pk)
-        serializer = ChatMessageSerializer(messages, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # Runs the IsChatOwner check on the chat
+        chat = self.get_object()
+        messages = chat.messages.all()
+        paginator = ChatMessagePagination()
+        page = paginator.paginate_queryset(messages, request, view=self)
+        serializer = ChatHistoryMessageSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
 
 class ChatMessageViewSet(viewsets.ModelViewSet):
@@ -0,0 +1,106 @@
+import asyncio
+import atexit
+import logging
+
+from channels.db import database_sync_to_async
+from django.conf import settings
+
+from .models import ChatMessage
+
+logger = logging.getLogger(__name__)
+
+
+class DurabilityMode:
+    # Persist before broadcasting, one INSERT per message
+    WRITE_THROUGH = "write_through"
+    # Broadcast first, persist in batches with bulk_create
+    WRITE_BEHIND = "write_behind"
+
+
+class ChatMessageWriter:
+    """
+    Per-process message writer. In write-behind mode messages are queued and
+    flushed with one `bulk_create` once `batch_size` messages are waiting or
+    `flush_interval` seconds after the first queued one, whichever comes first.
+    Batches that fail to save are logged and queued again, up to
+    `max_buffer_size` waiting messages.
+    """
+
+    def __init__(self, durability, batch_size, flush_interval, max_buffer_size=None):
+        self.durability = durability
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer_size = max_buffer_size or batch_size * 10
+        self.buffer = []
+        self.flush_task = None
+
+    async def write(self, message):
+        message.clean()
+
+        if self.durability == DurabilityMode.WRITE_THROUGH:
+            await database_sync_to_async(self.save_messages)([message])
+            return
+
+        self.buffer.append(message)
+        if len(self.buffer) >= self.batch_size:
+            await self.flush()
+        else:
+            self.schedule_flush()
+
+    def schedule_flush(self):
+        if self.flush_task is None or self.flush_task.done():
+            self.flush_task = asyncio.ensure_future(self.flush_later())
+
+    async def flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        # A failed flush below schedules its own retry
+        self.flush_task = None
+        await self.flush()
+
+    async def flush(self):
+        messages, self.buffer = self.buffer, []
+        if not messages:
+            return
+
+        try:
+            await database_sync_to_async(self.save_messages)(messages)
+        except Exception:
+            logger.exception("Could not save %s chat messages, retrying", len(messages))
+            self.requeue(messages)
+
+    def requeue(self, messages):
+        # Ahead of the messages queued meanwhile, so they are saved in order
+        self.buffer[:0] = messages
+        overflow = len(self.buffer) - self.max_buffer_size
+        if overflow > 0:
+            logger.error(
+                "Chat message buffer is full, dropping the %s oldest messages",
+                overflow,
+            )
+            del self.buffer[:overflow]
+        self.schedule_flush()
+
+    def flush_sync(self):
+        # Last chance flush when the process exits without an event loop
+        messages, self.buffer = self.buffer, []
+        if not messages:
+            return
+
+        try:
+            self.save_messages(messages)
+        except Exception:
+            logger.exception("Could not save %s chat messages on exit", len(messages))
+
+    @staticmethod
+    def save_messages(messages):
+        ChatMessage.objects.bulk_create(messages, batch_size=500)
+
+
+message_writer = ChatMessageWriter(
+    durability=getattr(
+        settings, "CHAT_MESSAGE_DURABILITY", DurabilityMode.WRITE_BEHIND
+    ),
+    batch_size=getattr(settings, "CHAT_MESSAGE_BATCH_SIZE", 100),
+    flush_interval=getattr(settings, "CHAT_MESSAGE_FLUSH_INTERVAL", 0.5),
+)
+atexit.register(message_writer.flush_sync)
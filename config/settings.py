@@ -1,9 +1,8 @@
 from datetime import timedelta
-# import dj_database_url
 
+import dj_database_url
 import environ
 
-
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = environ.Path(__file__) - 2
 
@@ -12,16 +11,43 @@ env = environ.Env(
     DEBUG=(bool, False),
     SECRET_KEY=(str, ""),
     ALLOWED_HOSTS=(list, []),
-
-    DB_ENGINE=(str, 'django.db.backends.postgresql'),
-    DB_NAME=(str, ''),
-    DB_USER=(str, ''),
-    DB_PASSWORD=(str, ''),
-    DB_HOST=(str, ''),
-    DB_PORT=(str, '5432'),
-    GOOGLE_APP_PASSWORD=(str,''),
-    GOOGLE_CLIENT_ID=(str,'')
-
+    DB_ENGINE=(str, "django.db.backends.postgresql"),
+    DB_NAME=(str, ""),
+    DB_USER=(str, ""),
+    DB_PASSWORD=(str, ""),
+    DB_HOST=(str, ""),
+    DB_PORT=(str, "5432"),
+    DATABASE_URL=(str, ""),
+    DB_CONN_MAX_AGE=(int, 0),
+    DB_CONN_HEALTH_CHECKS=(bool, True),
+    DB_POOL=(bool, False),
+    DB_POOL_MIN_SIZE=(int, 2),
+    DB_POOL_MAX_SIZE=(int, 10),
+    DB_POOL_TIMEOUT=(float, 10.0),
+    SQLITE_BUSY_TIMEOUT=(int, 5000),
+    DATABASE_REPLICA_URL=(str, ""),
+    REPLICA_STICKY_SECONDS=(int, 10),
+    CACHE_URL=(str, ""),
+    QUERY_BUDGET_ENABLED=(bool, False),
+    QUERY_BUDGET_DEFAULT=(int, 30),
+    QUERY_BUDGET_DUPLICATES=(int, 5),
+    QUERY_BUDGET_RAISE=(bool, False),
+    GOOGLE_APP_PASSWORD=(str, ""),
+    GOOGLE_CLIENT_ID=(str, ""),
+    CHAT_MESSAGE_DURABILITY=(str, "write_behind"),
+    CHAT_MESSAGE_BATCH_SIZE=(int, 100),
+    CHAT_MESSAGE_FLUSH_INTERVAL=(float, 0.5),
+    CHANNEL_REDIS_HOSTS=(list, []),
+    CHANNEL_LAYER_CAPACITY=(int, 100),
+    CHANNEL_LAYER_CONSUMER_CAPACITY=(int, 200),
+    CHANNEL_LAYER_EXPIRY=(int, 60),
+    ATTACHMENT_VARIANT_WIDTHS=(list, [320, 640, 1280]),
+    ATTACHMENT_VARIANT_FORMAT=(str, "WEBP"),
+    ATTACHMENT_VARIANT_QUALITY=(int, 80),
+    ATTACHMENT_VARIANT_WORKERS=(int, 2),
+    KPAY_QR_DECODE_WORKERS=(int, 2),
+    KPAY_QR_DECODE_MAX_SIZE=(int, 1024),
+    UUID_V7_PRIMARY_KEYS=(bool, False),
 )
 
 # Read .env file
@@ -52,6 +78,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "django.contrib.sites",
+    "django.contrib.postgres",
     # Third Party Apps
     "corsheaders",
     "rest_framework",
@@ -73,6 +100,8 @@ INSTALLED_APPS = [
     "transactions",
     "events",
     "activities",
+    "notifications",
+    "search",
 ]
 
 ASGI_APPLICATION = "config.asgi.application"
@@ -80,6 +109,7 @@ ASGI_APPLICATION = "config.asgi.application"
 SITE_ID = 1
 
 MIDDLEWARE = [
+    "core.middlewares.QueryBudgetMiddleware",
     "allauth.account.middleware.AccountMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -88,7 +118,8 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware"
+    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "core.middlewares.ReplicaStickinessMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -116,13 +147,67 @@ WSGI_APPLICATION = "config.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR("db.sqlite3"),
+# DATABASE_URL wins, then the DB_* variables (when DB_NAME is set), otherwise
+# a local SQLite file
+if env("DATABASE_URL"):
+    DATABASES = {"default": dj_database_url.parse(env("DATABASE_URL"))}
+elif env("DB_NAME"):
+    DATABASES = {
+        "default": {
+            "ENGINE": env("DB_ENGINE"),
+            "NAME": env("DB_NAME"),
+            "USER": env("DB_USER"),
+            "PASSWORD": env("DB_PASSWORD"),
+            "HOST": env("DB_HOST"),
+            "PORT": env("DB_PORT"),
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR("db.sqlite3"),
+        }
     }
-}
 
+# Optional read replica, used by views that opt in with ReplicaReadMixin (see
+# core.routers). Tests read the replica through the default database
+if env("DATABASE_REPLICA_URL"):
+    DATABASES["replica"] = dj_database_url.parse(env("DATABASE_REPLICA_URL"))
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+
+DATABASE_ROUTERS = ["core.routers.ReplicaRouter"]
+
+for database in DATABASES.values():
+    if database["ENGINE"] == "django.db.backends.sqlite3":
+        database["OPTIONS"] = {
+            # WAL lets readers run alongside the writer, and writers wait for the
+            # lock instead of failing with "database is locked"
+            "init_command": (
+                "PRAGMA journal_mode=WAL;"
+                "PRAGMA synchronous=NORMAL;"
+                f"PRAGMA busy_timeout={env('SQLITE_BUSY_TIMEOUT')};"
+            ),
+            # Take the write lock when the transaction starts, so waiting writers
+            # queue on busy_timeout instead of failing on a lock upgrade
+            "transaction_mode": "IMMEDIATE",
+        }
+    elif env("DB_POOL"):
+        # psycopg 3 connection pool, one per worker process and database:
+        # workers x DB_POOL_MAX_SIZE must stay below the server's max_connections.
+        # The pool replaces persistent connections, which leak under ASGI (Daphne)
+        database["CONN_MAX_AGE"] = 0
+        database.setdefault("OPTIONS", {})["pool"] = {
+            "min_size": env("DB_POOL_MIN_SIZE"),
+            "max_size": env("DB_POOL_MAX_SIZE"),
+            "timeout": env("DB_POOL_TIMEOUT"),
+        }
+    else:
+        # Daphne runs every sync view in a fresh thread, so persistent connections
+        # are never reused there and pile up until the server runs out: keep
+        # DB_CONN_MAX_AGE at 0 under ASGI and only raise it for gunicorn/WSGI
+        database["CONN_MAX_AGE"] = env("DB_CONN_MAX_AGE")
+        database["CONN_HEALTH_CHECKS"] = env("DB_CONN_HEALTH_CHECKS")
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -162,7 +247,7 @@ STATIC_URL = "static/"
 
 STATIC_ROOT = BASE_DIR("staticfiles")
 
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
@@ -244,8 +329,94 @@ AUTHENTICATION_BACKENDS = (
     "allauth.account.auth_backends.AuthenticationBackend",
 )
 
-CHANNEL_LAYERS = {
-    "default": {
-        "BACKEND": "channels.layers.InMemoryChannelLayer",
-    },
-}
+# Users behind WebSocket access tokens are cached per process (see core.middlewares).
+# Deactivations reach the other processes through the shared cache (CACHE_URL)
+JWT_USER_CACHE_SIZE = 10000
+JWT_USER_CACHE_TTL = 300  # seconds, never longer than the token's own expiry
+
+# Without CHANNEL_REDIS_HOSTS realtime traffic only works inside one process (dev).
+# With one or more redis:// URLs every Daphne worker shares the layer, groups (one
+# per chat room / user) are sharded across the hosts by consistent hashing and
+# group_send reaches all members of a shard in one round trip.
+CHANNEL_REDIS_HOSTS = env("CHANNEL_REDIS_HOSTS")
+
+if CHANNEL_REDIS_HOSTS:
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels_redis.core.RedisChannelLayer",
+            "CONFIG": {
+                "hosts": CHANNEL_REDIS_HOSTS,
+                # Messages waiting per channel before sends fail with ChannelFull
+                "capacity": env("CHANNEL_LAYER_CAPACITY"),
+                "channel_capacity": {
+                    # Inboxes of the chat/notification consumers
+                    "specific.*": env("CHANNEL_LAYER_CONSUMER_CAPACITY"),
+                },
+                "expiry": env("CHANNEL_LAYER_EXPIRY"),
+                "group_expiry": 86400,
+            },
+        },
+    }
+else:
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels.layers.InMemoryChannelLayer",
+        },
+    }
+
+# Chat message persistence: "write_behind" broadcasts first and saves in batches,
+# "write_through" saves every message before it is broadcast
+CHAT_MESSAGE_DURABILITY = env("CHAT_MESSAGE_DURABILITY")
+CHAT_MESSAGE_BATCH_SIZE = env("CHAT_MESSAGE_BATCH_SIZE")
+CHAT_MESSAGE_FLUSH_INTERVAL = env("CHAT_MESSAGE_FLUSH_INTERVAL")
+
+# Resized variants of uploaded images, generated off the request path by a
+# per-process thread pool (see attachments.variants). Images are never upscaled,
+# and the format is WEBP or JPEG
+ATTACHMENT_VARIANT_WIDTHS = [int(width) for width in env("ATTACHMENT_VARIANT_WIDTHS")]
+ATTACHMENT_VARIANT_FORMAT = env("ATTACHMENT_VARIANT_FORMAT").upper()
+ATTACHMENT_VARIANT_QUALITY = env("ATTACHMENT_VARIANT_QUALITY")
+ATTACHMENT_VARIANT_WORKERS = env("ATTACHMENT_VARIANT_WORKERS")
+
+# KPay QR images are decoded by a bounded pool of worker processes (see
+# organizations.services), downscaled to KPAY_QR_DECODE_MAX_SIZE pixels first
+KPAY_QR_DECODE_WORKERS = env("KPAY_QR_DECODE_WORKERS")
+KPAY_QR_DECODE_MAX_SIZE = env("KPAY_QR_DECODE_MAX_SIZE")
+
+# New rows get time-ordered UUIDv7 primary keys instead of random UUIDv4 ones
+# (see core.ids), so inserts append to the primary key indexes. Existing ids
+# are kept. The ids then reveal when a row was created
+UUID_V7_PRIMARY_KEYS = env("UUID_V7_PRIMARY_KEYS")
+
+# After a write, the user's reads stay on the primary database for this many
+# seconds (signed cookie and per-user cache entry), so they see their own
+# changes while the replica catches up
+REPLICA_STICKY_SECONDS = env("REPLICA_STICKY_SECONDS")
+
+# Cache shared by every worker process (replica pins of token clients, ...).
+# Without CACHE_URL each process has its own in-memory cache, which is only
+# correct with a single worker
+if env("CACHE_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": env("CACHE_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Query instrumentation (see core.middlewares.QueryBudgetMiddleware): per-request
+# query counts and database time in a Server-Timing header, and a warning for
+# requests over their view's query budget (QUERY_BUDGET_DEFAULT for views that
+# declare none) or repeating a statement more than QUERY_BUDGET_DUPLICATES
+# times. QUERY_BUDGET_RAISE turns budget overruns into errors, for local runs
+# and CI
+QUERY_BUDGET_ENABLED = env("QUERY_BUDGET_ENABLED")
+QUERY_BUDGET_DEFAULT = env("QUERY_BUDGET_DEFAULT")
+QUERY_BUDGET_DUPLICATES = env("QUERY_BUDGET_DUPLICATES")
+QUERY_BUDGET_RAISE = env("QUERY_BUDGET_RAISE")
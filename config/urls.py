@@ -23,6 +23,7 @@ from rest_framework.authtoken.views import obtain_auth_token
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
 from accounts.views import GoogleLogin
+from core.views import QueryBudgetStatsView, TokenUserCacheStatsView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -44,6 +45,18 @@ urlpatterns = [
     path("api/", include("chat.urls")),
     path("api/", include("events.urls")),
     path("api/", include("activities.urls")),
+    path("api/", include("notifications.urls")),
+    path("api/", include("search.urls")),
+    path(
+        "api/monitoring/token-cache/",
+        TokenUserCacheStatsView.as_view(),
+        name="token-cache-stats",
+    ),
+    path(
+        "api/monitoring/query-budgets/",
+        QueryBudgetStatsView.as_view(),
+        name="query-budget-stats",
+    ),
 ]
 
 if settings.DEBUG:
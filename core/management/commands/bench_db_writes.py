@@ -0,0 +1,100 @@
+import statistics
+import threading
+import time
+
+from django.apps.registry import Apps
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connection, models, transaction
+
+
+class BenchWrite(models.Model):
+    payload = models.CharField(max_length=100)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        # Scratch table, registered outside the app registry
+        apps = Apps()
+        app_label = "core"
+        db_table = "core_bench_write"
+
+
+class Command(BaseCommand):
+    help = "Measure write throughput of the configured database under concurrent workers, each committing one INSERT per transaction."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            nargs="+",
+            default=[1, 4, 8, 16],
+            help="Worker counts to run, one round each.",
+        )
+        parser.add_argument(
+            "--writes", type=int, default=500, help="Transactions per worker."
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{connection.vendor} {connection.settings_dict['NAME']}, "
+            f"{options['writes']} writes per worker"
+        )
+        with connection.schema_editor() as schema_editor:
+            schema_editor.create_model(BenchWrite)
+
+        try:
+            for workers in options["workers"]:
+                self.run_round(workers, options["writes"])
+        finally:
+            with connection.schema_editor() as schema_editor:
+                schema_editor.delete_model(BenchWrite)
+
+    def run_round(self, workers, writes):
+        latencies = []
+        errors = []
+        lock = threading.Lock()
+        barrier = threading.Barrier(workers)
+
+        def worker():
+            # Every thread has its own connection, like a worker process
+            worker_latencies, worker_errors = [], 0
+            try:
+                barrier.wait()
+                for _ in range(writes):
+                    started = time.perf_counter()
+                    try:
+                        with transaction.atomic():
+                            BenchWrite.objects.create(payload="benchmark")
+                    except DatabaseError:
+                        worker_errors += 1
+                        continue
+                    worker_latencies.append(time.perf_counter() - started)
+            finally:
+                connection.close()
+
+            with lock:
+                latencies.extend(worker_latencies)
+                errors.append(worker_errors)
+
+        threads = [threading.Thread(target=worker) for _ in range(workers)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        if len(latencies) > 1:
+            quantiles = statistics.quantiles(latencies, n=100)
+            p50, p95 = quantiles[49] * 1000, quantiles[94] * 1000
+        else:
+            p50 = p95 = 0.0
+
+        summary = (
+            f"{workers:>3} workers: {len(latencies) / elapsed:8.0f} writes/s, "
+            f"p50 {p50:.1f} ms, p95 {p95:.1f} ms"
+        )
+        failed = sum(errors)
+        if failed:
+            self.stdout.write(self.style.WARNING(f"⚠️ {summary}, {failed} failed"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"✅ {summary}"))
@@ -0,0 +1,109 @@
+import time
+from uuid import uuid4
+
+from django.apps.registry import Apps
+from django.core.management.base import BaseCommand
+from django.db import connection, models, transaction
+
+from core.ids import uuid7
+
+ID_GENERATORS = {"v4": uuid4, "v7": uuid7}
+
+
+def get_bench_model(version):
+    """Scratch model with a UUID primary key, registered outside the app registry"""
+
+    class Meta:
+        apps = Apps()
+        app_label = "core"
+        db_table = f"core_bench_uuid_{version}"
+
+    return type(
+        f"BenchUUID{version.upper()}",
+        (models.Model,),
+        {
+            "__module__": __name__,
+            "Meta": Meta,
+            "id": models.UUIDField(primary_key=True),
+            "created_at": models.DateTimeField(auto_now_add=True),
+            "payload": models.CharField(max_length=100),
+        },
+    )
+
+
+def get_index_size(model):
+    if connection.vendor != "postgresql":
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_relation_size(indexrelid) FROM pg_index "
+            "WHERE indrelid = %s::regclass AND indisprimary",
+            [model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+class Command(BaseCommand):
+    help = "Compare insert throughput of UUIDv4 and UUIDv7 primary keys on scratch tables, which are dropped afterwards."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=2_000_000)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--uuid-version", action="append", choices=list(ID_GENERATORS), default=[]
+        )
+
+    def handle(self, *args, **options):
+        rows, batch_size = options["rows"], options["batch_size"]
+        # Throughput of the first and last tenth shows how inserts slow down as
+        # the index outgrows the cache
+        report_rows = max(rows // 10, batch_size)
+
+        for version in options["uuid_version"] or list(ID_GENERATORS):
+            generate_id = ID_GENERATORS[version]
+            model = get_bench_model(version)
+            with connection.schema_editor() as schema_editor:
+                schema_editor.create_model(model)
+
+            try:
+                timings = []
+                inserted = 0
+                started = time.perf_counter()
+                while inserted < rows:
+                    count = min(batch_size, rows - inserted)
+                    batch_started = time.perf_counter()
+                    with transaction.atomic():
+                        model.objects.bulk_create(
+                            [
+                                model(id=generate_id(), payload="benchmark")
+                                for _ in range(count)
+                            ]
+                        )
+                    timings.append((count, time.perf_counter() - batch_started))
+                    inserted += count
+                total = time.perf_counter() - started
+                index_size = get_index_size(model)
+            finally:
+                with connection.schema_editor() as schema_editor:
+                    schema_editor.delete_model(model)
+
+            first, last = [0, 0.0], [0, 0.0]
+            for count, elapsed in timings:
+                if first[0] < report_rows:
+                    first[0] += count
+                    first[1] += elapsed
+            for count, elapsed in reversed(timings):
+                if last[0] < report_rows:
+                    last[0] += count
+                    last[1] += elapsed
+
+            summary = (
+                f"{version}: {rows} rows in {total:.2f}s ({rows / total:.0f}/s), "
+                f"first {first[0]} at {first[0] / first[1]:.0f}/s, "
+                f"last {last[0]} at {last[0] / last[1]:.0f}/s"
+            )
+            if index_size is not None:
+                summary += f", primary key index {index_size / 1024 / 1024:.1f} MB"
+            self.stdout.write(self.style.SUCCESS(f"✅ {summary}"))
@@ -0,0 +1,60 @@
+import asyncio
+import sys
+from uuid import uuid4
+
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Check that the channel layer delivers group messages across worker processes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--timeout", type=float, default=5)
+        # Internal: run as the sending worker
+        parser.add_argument(
+            "--send", metavar="GROUP", help="Send one message to GROUP and exit."
+        )
+
+    def handle(self, *args, **options):
+        if options["send"]:
+            asyncio.run(self.send(options["send"]))
+            return
+
+        backend = settings.CHANNEL_LAYERS["default"]["BACKEND"]
+        self.stdout.write(self.style.NOTICE(f"Checking {backend}..."))
+
+        if not asyncio.run(
+            self.receive(f"layer_check_{uuid4().hex}", options["timeout"])
+        ):
+            raise CommandError("❌ No message crossed the process boundary")
+
+        self.stdout.write(
+            self.style.SUCCESS("✅ Group message delivered across processes")
+        )
+
+    async def send(self, group):
+        await get_channel_layer().group_send(group, {"type": "layer.check"})
+
+    async def receive(self, group, timeout):
+        channel_layer = get_channel_layer()
+        channel = await channel_layer.new_channel()
+        await channel_layer.group_add(group, channel)
+
+        # The sender is a separate interpreter, like another Daphne worker
+        worker = await asyncio.create_subprocess_exec(
+            sys.executable, sys.argv[0], "check_channel_layer", "--send", group
+        )
+        await worker.wait()
+
+        try:
+            message = await asyncio.wait_for(channel_layer.receive(channel), timeout)
+        except TimeoutError:
+            return False
+        finally:
+            await channel_layer.group_discard(group, channel)
+
+        return message["type"] == "layer.check"
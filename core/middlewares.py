@@ -1,22 +1,178 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+
 from channels.db import database_sync_to_async
+from django.conf import settings
 
 # get_user_model() function is Django's recommended way to get the active user model.
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import AccessToken
 
+from .queries import QueryBudgetExceeded, QueryRecorder, query_budget_stats
+from .routers import STICKY_COOKIE, has_replica, pin_to_primary
+
+logger = logging.getLogger(__name__)
+
+TOKEN_QUERY_PARAM = b"access_token="
+# When a user was last deactivated or deleted, in the shared cache
+USER_REVOKED_KEY = "token_user_revoked:{}"
+
+
+class TokenUserCache:
+    """
+    Bounded in-memory cache of the users behind validated access tokens, keyed
+    by the token's `jti`. Entries never outlive the token itself. Entries cached
+    before the user was last revoked (deactivated or deleted, in any process)
+    are treated as misses.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, revoked_at=None):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            user, expires_at, cached_at = entry
+            if expires_at <= time.monotonic() or (
+                revoked_at is not None and cached_at <= revoked_at
+            ):
+                del self.entries[key]
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return user
+
+    def set(self, key, user, token_expires_at):
+        lifetime = min(self.ttl, token_expires_at - time.time())
+        if lifetime <= 0:
+            return
+
+        with self.lock:
+            self.entries[key] = (user, time.monotonic() + lifetime, time.time())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id):
+        with self.lock:
+            for key in [
+                key for key, (user, *_) in self.entries.items() if user.pk == user_id
+            ]:
+                del self.entries[key]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            return {
+                "size": len(self.entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+token_user_cache = TokenUserCache(
+    max_size=getattr(settings, "JWT_USER_CACHE_SIZE", 10000),
+    ttl=getattr(settings, "JWT_USER_CACHE_TTL", 300),
+)
+# Lookups in flight, so a reconnect storm for one token queries the database once
+pending_lookups = {}
+
+
+def revoke_cached_user(user_id):
+    """
+    Stop serving the user from the token caches of every process. Other processes
+    see the revocation through the shared cache (CACHE_URL)
+    """
+    token_user_cache.invalidate_user(user_id)
+    cache.set(USER_REVOKED_KEY.format(user_id), time.time(), token_user_cache.ttl)
+
 
 @database_sync_to_async
-def get_user_from_token(token):
+def get_user_by_id(user_id):
+    User = get_user_model()
+    return User.objects.filter(id=user_id, is_active=True).first()
+
+
+async def get_user_from_token(token):
     try:
         access_token = AccessToken(token)
-        user_id = access_token["user_id"]
-        User = get_user_model()
-        return User.objects.get(id=user_id)
-    except Exception as err:
-        print(f"Error occured: {err}")
+    except TokenError as err:
+        logger.warning("Rejected WebSocket access token: %s", err)
+        return AnonymousUser()
+
+    user_id = access_token["user_id"]
+    key = access_token.get("jti") or token
+    revoked_at = await cache.aget(USER_REVOKED_KEY.format(user_id))
+    user = token_user_cache.get(key, revoked_at)
+    if user is not None:
+        return user
+
+    lookup = pending_lookups.get(key)
+    if lookup is None:
+        lookup = asyncio.ensure_future(get_user_by_id(user_id))
+        pending_lookups[key] = lookup
+        lookup.add_done_callback(lambda _: pending_lookups.pop(key, None))
+
+    try:
+        user = await asyncio.shield(lookup)
+    except Exception:
+        logger.exception("Could not load the user of a WebSocket access token")
+        return AnonymousUser()
+
+    if user is None:
         return AnonymousUser()
 
+    token_user_cache.set(key, user, access_token["exp"])
+    return user
+
+
+def get_query_param(query_string, name):
+    """
+    Value of `name` (bytes, including the trailing "=") in a raw query string,
+    found by scanning instead of splitting the whole string
+    """
+    start = 0
+    while True:
+        start = query_string.find(name, start)
+        if start == -1:
+            return None
+
+        # Only match at the beginning of a parameter, not inside another one
+        if start == 0 or query_string[start - 1] == ord("&"):
+            break
+        start += len(name)
+
+    start += len(name)
+    end = query_string.find(b"&", start)
+    value = query_string[start:] if end == -1 else query_string[start:end]
+    return value.decode("utf-8")
+
 
 class JWTAuthMiddleware:
     def __init__(self, app):
@@ -24,16 +180,101 @@ class JWTAuthMiddleware:
         self.app = app
 
     async def __call__(self, scope, receive, send):
-        query_string = scope.get("query_string", b"").decode("utf-8")
-        token = None
         # Extract the token from the query string
-        for param in query_string.split("&"):
-            if param.startswith("access_token="):
-                token = param.split("=")[1]
-                break
+        token = get_query_param(scope.get("query_string", b""), TOKEN_QUERY_PARAM)
 
         scope["user"] = (
             AnonymousUser() if token is None else await get_user_from_token(token)
         )
 
         return await self.app(scope, receive, send)
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Pin the client to the primary database for REPLICA_STICKY_SECONDS after a
+    successful write, with a signed cookie for browsers and a per-user entry in
+    the shared cache for token clients, so replica reads never hide their own
+    changes.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if (
+            has_replica()
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+        ):
+            response.set_signed_cookie(
+                STICKY_COOKIE,
+                "1",
+                salt=STICKY_COOKIE,
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+            # DRF sets the user authenticated by the view on the request
+            user = getattr(request, "user", None)
+            if user is not None and user.is_authenticated:
+                pin_to_primary(user.pk)
+
+        return response
+
+
+class QueryBudgetMiddleware:
+    """
+    Count the queries, database time and repeated statements of every request.
+    The totals go out as a `Server-Timing` header and into the per-endpoint
+    report, and requests over their query budget (declared by the view with
+    QueryBudgetMixin, QUERY_BUDGET_DEFAULT otherwise) or repeating one
+    statement more than QUERY_BUDGET_DUPLICATES times are logged.
+    """
+
+    def __init__(self, get_response):
+        if not settings.QUERY_BUDGET_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        with recorder.record():
+            response = self.get_response(request)
+
+        budget = getattr(request, "query_budget", None)
+        if budget is None:
+            budget = settings.QUERY_BUDGET_DEFAULT
+        endpoint = getattr(request, "query_budget_endpoint", None) or (
+            request.resolver_match.view_name if request.resolver_match else "unresolved"
+        )
+        query_budget_stats.add(endpoint, recorder, budget)
+
+        server_timing = (
+            f'db;dur={recorder.duration * 1000:.1f};desc="{recorder.count} queries"'
+        )
+        if response.has_header("Server-Timing"):
+            server_timing = f"{response['Server-Timing']}, {server_timing}"
+        response["Server-Timing"] = server_timing
+
+        over_budget = recorder.count > budget
+        repeated = {
+            sql: count
+            for sql, count in recorder.duplicates.items()
+            if count > settings.QUERY_BUDGET_DUPLICATES
+        }
+        if over_budget or repeated:
+            message = (
+                f"{request.method} {request.path} ({endpoint}) ran {recorder.count} "
+                f"queries in {recorder.duration * 1000:.1f} ms, budget {budget}"
+            )
+            for sql, count in sorted(repeated.items(), key=lambda item: -item[1]):
+                message += f"\n  {count}x {sql}"
+            logger.warning(message)
+
+            if over_budget and settings.QUERY_BUDGET_RAISE:
+                raise QueryBudgetExceeded(message)
+
+        return response
@@ -1,11 +1,12 @@
-from uuid import uuid4
-
 from django.contrib.contenttypes.fields import GenericRelation
 from django.db import models
+from django.db.models import Prefetch
+
+from .ids import generate_id
 
 
 class BaseModel(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=generate_id, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -13,10 +14,40 @@ class BaseModel(models.Model):
         abstract = True
 
 
+def attachments_prefetch(lookup="attachments"):
+    """
+    Prefetch of a generic `attachments` relation, one query per lookup for the
+    whole page, loading only the columns attachment serializers render
+    """
+    from attachments.models import Attachment
+
+    return Prefetch(
+        lookup,
+        queryset=Attachment.objects.only(
+            "id", "file", "variants", "content_type", "object_id"
+        ),
+    )
+
+
+class AttachableQuerySet(models.QuerySet):
+    def with_attachments(self, *related):
+        """
+        Prefetch the attachments of these objects and of the related attachable
+        objects in `related` (e.g. "organization"), so serializers read them
+        from the prefetch cache.
+        """
+        return self.prefetch_related(
+            attachments_prefetch(),
+            *(attachments_prefetch(f"{lookup}__attachments") for lookup in related),
+        )
+
+
 class AttachableModel(models.Model):
     attachments = GenericRelation(
         "attachments.Attachment", related_query_name="%(class)s"
     )
 
+    objects = AttachableQuerySet.as_manager()
+
     class Meta:
         abstract = True
@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryRecorder:
+    """
+    Execute wrapper counting the queries, their total time and how often each
+    statement ran. Statements are compared without their parameters, so an
+    N+1 shows up as one statement repeated N times.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.statements[sql] += 1
+
+    @property
+    def duplicates(self):
+        return {sql: count for sql, count in self.statements.items() if count > 1}
+
+    @contextmanager
+    def record(self):
+        # Every database alias (e.g. a read replica) of the current thread
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self))
+            yield self
+
+
+def get_query_budget(view, action=None):
+    """
+    Query budget a view declares for `action`: `query_budget` is either a
+    number for every action or a dict by action, with an optional "default".
+    """
+    budget = getattr(view, "query_budget", None)
+    if isinstance(budget, dict):
+        return budget.get(action, budget.get("default"))
+    return budget
+
+
+class QueryBudgetStats:
+    """Per-endpoint query counts of the requests served by this process"""
+
+    def __init__(self):
+        self.endpoints = {}
+        self.lock = threading.Lock()
+
+    def add(self, endpoint, recorder, budget):
+        with self.lock:
+            stats = self.endpoints.setdefault(
+                endpoint,
+                {
+                    "requests": 0,
+                    "over_budget": 0,
+                    "budget": budget,
+                    "max_queries": 0,
+                    "total_queries": 0,
+                    "total_db_ms": 0.0,
+                },
+            )
+            stats["requests"] += 1
+            stats["budget"] = budget
+            stats["max_queries"] = max(stats["max_queries"], recorder.count)
+            stats["total_queries"] += recorder.count
+            stats["total_db_ms"] += recorder.duration * 1000
+            if budget is not None and recorder.count > budget:
+                stats["over_budget"] += 1
+
+    def report(self):
+        with self.lock:
+            return {
+                endpoint: {
+                    **stats,
+                    "avg_queries": round(stats["total_queries"] / stats["requests"], 1),
+                    "avg_db_ms": round(stats["total_db_ms"] / stats["requests"], 2),
+                    "total_db_ms": round(stats["total_db_ms"], 2),
+                }
+                for endpoint, stats in sorted(self.endpoints.items())
+            }
+
+    def clear(self):
+        with self.lock:
+            self.endpoints.clear()
+
+
+query_budget_stats = QueryBudgetStats()
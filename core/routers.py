@@ -0,0 +1,73 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+REPLICA_DATABASE = "replica"
+PRIMARY_DATABASE = "default"
+STICKY_COOKIE = "db_pin"
+STICKY_CACHE_KEY = "db_pin:{}"
+
+# Set while a request (or a `read_from_replica` block) may read from the replica
+use_replica = ContextVar("use_replica", default=False)
+
+
+def has_replica():
+    return REPLICA_DATABASE in settings.DATABASES
+
+
+@contextmanager
+def read_from_replica():
+    token = use_replica.set(has_replica())
+    try:
+        yield
+    finally:
+        use_replica.reset(token)
+
+
+def pin_to_primary(user_id):
+    """Keep the user's reads on the primary while the replica catches up"""
+    cache.set(STICKY_CACHE_KEY.format(user_id), True, settings.REPLICA_STICKY_SECONDS)
+
+
+def is_pinned_to_primary(request):
+    # The cookie is signed with its creation time, so any worker can tell whether
+    # the pin is still running and clients cannot pin themselves forever
+    pinned = request.get_signed_cookie(
+        STICKY_COOKIE,
+        default=None,
+        salt=STICKY_COOKIE,
+        max_age=settings.REPLICA_STICKY_SECONDS,
+    )
+    if pinned is not None:
+        return True
+
+    user = getattr(request, "user", None)
+    return bool(
+        user is not None
+        and user.is_authenticated
+        and cache.get(STICKY_CACHE_KEY.format(user.pk))
+    )
+
+
+class ReplicaRouter:
+    """
+    Reads go to the replica only inside `read_from_replica()` (which views opt
+    into with `ReplicaReadMixin`), everything else stays on the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if use_replica.get():
+            return REPLICA_DATABASE
+        return PRIMARY_DATABASE
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY_DATABASE
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both databases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY_DATABASE
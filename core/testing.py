@@ -0,0 +1,47 @@
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from .queries import QueryBudgetExceeded, QueryRecorder, get_query_budget
+
+
+def assertMaxQueries(
+    view, n=None, path="/", method="get", user=None, data=None, **kwargs
+):
+    """
+    Call `view` (the result of `as_view()`) and fail when it runs more than `n`
+    queries, or more than the view's own `query_budget` when `n` is omitted.
+    Extra keyword arguments are passed to the view as URL kwargs, e.g.
+
+        assertMaxQueries(
+            EventViewSet.as_view({"get": "list"}), user=donor, organization_pk=pk
+        )
+
+    Returns the response, and lists the repeated statements on failure.
+    """
+    view_class = getattr(view, "cls", getattr(view, "view_class", None))
+    if n is None:
+        action = (getattr(view, "actions", None) or {}).get(method)
+        n = get_query_budget(view_class, action)
+    if n is None:
+        raise ValueError(f"{view_class.__name__} declares no query budget, pass n")
+
+    request = getattr(APIRequestFactory(), method)(path, data=data, format="json")
+    if user is not None:
+        force_authenticate(request, user=user)
+
+    recorder = QueryRecorder()
+    with recorder.record():
+        response = view(request, **kwargs)
+        if hasattr(response, "render"):
+            response.render()
+
+    if recorder.count > n:
+        message = (
+            f"{view_class.__name__} ran {recorder.count} queries, at most {n} expected"
+        )
+        for sql, count in sorted(
+            recorder.duplicates.items(), key=lambda item: -item[1]
+        ):
+            message += f"\n  {count}x {sql}"
+        raise QueryBudgetExceeded(message)
+
+    return response
@@ -1 +1,244 @@
-# Create your tests here.
+import time
+import uuid
+from unittest import mock
+
+import redis
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from channels_redis.core import RedisChannelLayer
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.urls import re_path
+from redis.exceptions import RedisError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from notifications.consumers import NotificationConsumer
+
+from .ids import COUNTER_MAX, generate_id, uuid7
+from .middlewares import (
+    USER_REVOKED_KEY,
+    ReplicaStickinessMiddleware,
+    get_user_from_token,
+    token_user_cache,
+)
+from .routers import STICKY_COOKIE, is_pinned_to_primary
+
+REDIS_URL = (settings.CHANNEL_REDIS_HOSTS or ["redis://localhost:6379/0"])[0]
+
+REDIS_CHANNEL_LAYERS = {
+    "default": {
+        "BACKEND": "channels_redis.core.RedisChannelLayer",
+        "CONFIG": {"hosts": [REDIS_URL], "prefix": "donatio-test"},
+    },
+}
+
+
+class ConnectedUser(AnonymousUser):
+    # Stand-in for an authenticated user, the consumer only checks is_anonymous
+    is_anonymous = False
+
+
+@override_settings(CHANNEL_LAYERS=REDIS_CHANNEL_LAYERS)
+class RedisChannelLayerTests(SimpleTestCase):
+    def setUp(self):
+        client = redis.Redis.from_url(REDIS_URL, socket_connect_timeout=1)
+        try:
+            client.ping()
+        except RedisError:
+            self.skipTest(f"Redis is not available at {REDIS_URL}")
+        finally:
+            client.close()
+
+    def other_process_layer(self):
+        # A separate layer instance shares nothing in memory with the consumer's
+        # layer, just like the layer of another Daphne worker.
+        return RedisChannelLayer(hosts=[REDIS_URL], prefix="donatio-test")
+
+    async def test_group_send_reaches_consumer_of_another_layer(self):
+        application = URLRouter(
+            [
+                re_path(
+                    r"^ws/notifications/(?P<room_name>\w+)/$",
+                    NotificationConsumer.as_asgi(),
+                )
+            ]
+        )
+        communicator = WebsocketCommunicator(application, "/ws/notifications/alice/")
+        communicator.scope["user"] = ConnectedUser()
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+
+        layer = self.other_process_layer()
+        try:
+            await layer.group_send(
+                "user_alice",
+                {"type": "send_notification", "notification": {"message": "hi"}},
+            )
+            response = await communicator.receive_json_from(timeout=5)
+        finally:
+            await communicator.disconnect()
+            await layer.flush()
+
+        self.assertEqual(response, {"notification": {"message": "hi"}})
+
+    async def test_group_membership_is_shared_between_layers(self):
+        first, second = self.other_process_layer(), self.other_process_layer()
+        channel = await first.new_channel()
+        try:
+            await first.group_add("user_bob", channel)
+            await second.group_send("user_bob", {"type": "ping"})
+            message = await first.receive(channel)
+        finally:
+            await first.flush()
+
+        self.assertEqual(message, {"type": "ping"})
+
+
+REPLICA_DATABASES = {
+    "default": settings.DATABASES["default"],
+    "replica": settings.DATABASES["default"],
+}
+
+
+@override_settings(DATABASES=REPLICA_DATABASES, REPLICA_STICKY_SECONDS=10)
+class ReplicaStickinessTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.middleware = ReplicaStickinessMiddleware(lambda request: HttpResponse())
+        cache.clear()
+
+    def write(self, user=None):
+        request = self.factory.post("/api/organizations/")
+        request.user = user or AnonymousUser()
+        return self.middleware(request)
+
+    def read(self, cookie=None, user=None):
+        request = self.factory.get("/api/organizations/")
+        if cookie is not None:
+            request.COOKIES[STICKY_COOKIE] = cookie
+        request.user = user or AnonymousUser()
+        return request
+
+    def test_write_pins_the_client_with_a_signed_cookie(self):
+        cookie = self.write().cookies[STICKY_COOKIE].value
+
+        self.assertTrue(is_pinned_to_primary(self.read(cookie)))
+
+    def test_forged_cookie_does_not_pin(self):
+        self.assertFalse(is_pinned_to_primary(self.read("1")))
+
+    def test_pin_expires_even_if_the_cookie_is_kept(self):
+        cookie = self.write().cookies[STICKY_COOKIE].value
+
+        with mock.patch("django.core.signing.time.time", return_value=time.time() + 11):
+            self.assertFalse(is_pinned_to_primary(self.read(cookie)))
+
+    def test_token_client_is_pinned_through_the_cache(self):
+        user = mock.Mock(pk=7, is_authenticated=True)
+        self.write(user)
+
+        self.assertTrue(is_pinned_to_primary(self.read(user=user)))
+        self.assertFalse(
+            is_pinned_to_primary(self.read(user=mock.Mock(pk=8, is_authenticated=True)))
+        )
+
+
+class TokenUserCacheTests(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="donor")
+        self.token = str(AccessToken.for_user(self.user))
+        token_user_cache.clear()
+        cache.clear()
+
+    async def test_cached_user_is_reused(self):
+        first = await get_user_from_token(self.token)
+        second = await get_user_from_token(self.token)
+
+        self.assertEqual(first.pk, self.user.pk)
+        self.assertIs(second, first)
+
+    async def test_deactivation_in_another_process_is_seen_on_cache_hit(self):
+        await get_user_from_token(self.token)
+
+        # Another worker deactivates the user: its signal only reaches this
+        # process through the shared cache
+        await User.objects.filter(pk=self.user.pk).aupdate(is_active=False)
+        await cache.aset(USER_REVOKED_KEY.format(self.user.pk), time.time())
+
+        user = await get_user_from_token(self.token)
+        self.assertTrue(user.is_anonymous)
+
+    async def test_reactivated_user_is_cached_again(self):
+        await cache.aset(USER_REVOKED_KEY.format(self.user.pk), time.time())
+
+        first = await get_user_from_token(self.token)
+        second = await get_user_from_token(self.token)
+
+        self.assertIs(second, first)
+
+    def test_deactivation_revokes_the_user(self):
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertIsNotNone(cache.get(USER_REVOKED_KEY.format(self.user.pk)))
+
+    async def test_invalid_token_is_logged(self):
+        with self.assertLogs("core.middlewares", level="WARNING"):
+            user = await get_user_from_token("not-a-token")
+
+        self.assertTrue(user.is_anonymous)
+
+
+class Uuid7Tests(SimpleTestCase):
+    def setUp(self):
+        # Each test starts from a clock no id has been generated at yet
+        patcher = mock.patch.dict(
+            "core.ids.uuid7_state", {"timestamp": 0, "counter": 0}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def generate(self, count, time_ns):
+        with mock.patch("core.ids.time.time_ns", return_value=time_ns):
+            return [uuid7() for _ in range(count)]
+
+    def test_version_and_variant(self):
+        for value in self.generate(100, time.time_ns()):
+            self.assertEqual(value.version, 7)
+            self.assertEqual(value.variant, uuid.RFC_4122)
+
+    def test_timestamp_is_in_milliseconds(self):
+        now = time.time_ns()
+
+        (value,) = self.generate(1, now)
+
+        self.assertEqual(value.int >> 80, now // 1_000_000)
+
+    def test_ids_of_the_same_millisecond_keep_increasing(self):
+        # Enough ids to run past the counter within one millisecond
+        ids = self.generate(COUNTER_MAX + 10, time.time_ns())
+
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), len(ids))
+
+    def test_ids_keep_increasing_when_the_clock_goes_back(self):
+        now = time.time_ns()
+        first = self.generate(10, now)
+        second = self.generate(10, now - 10**9)
+
+        self.assertEqual(first + second, sorted(first + second))
+
+    def test_generate_id_follows_the_setting(self):
+        with override_settings(UUID_V7_PRIMARY_KEYS=True):
+            self.assertEqual(generate_id().version, 7)
+        with override_settings(UUID_V7_PRIMARY_KEYS=False):
+            self.assertEqual(generate_id().version, 4)
@@ -1 +1,69 @@
-# Create your views here.
+from rest_framework.permissions import SAFE_METHODS, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .middlewares import token_user_cache
+from .queries import get_query_budget, query_budget_stats
+from .routers import has_replica, is_pinned_to_primary, use_replica
+
+
+class QueryBudgetMixin:
+    """
+    Declare the most queries a request to the view may run, as `query_budget`
+    (a number, or a dict by action such as {"list": 8, "retrieve": 6}). The
+    budget is checked by QueryBudgetMiddleware and core.testing.assertMaxQueries.
+    """
+
+    query_budget = None
+
+    def initial(self, request, *args, **kwargs):
+        action = getattr(self, "action", None)
+        # On the Django request, where the middleware reads them
+        request._request.query_budget = get_query_budget(self, action)
+        request._request.query_budget_endpoint = (
+            f"{type(self).__name__}.{action or request.method.lower()}"
+        )
+
+        super().initial(request, *args, **kwargs)
+
+
+class ReplicaReadMixin:
+    """
+    Serve safe-method requests of the view from the read replica, unless the
+    client wrote something in the last REPLICA_STICKY_SECONDS. Authentication
+    and permission checks still read the primary.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        if (
+            request.method in SAFE_METHODS
+            and has_replica()
+            and not is_pinned_to_primary(request)
+        ):
+            self.replica_token = use_replica.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, "replica_token", None)
+        if token is not None:
+            use_replica.reset(token)
+            self.replica_token = None
+
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+# Hit/miss counters of the WebSocket token cache of the process serving this request
+class TokenUserCacheStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(token_user_cache.stats())
+
+
+# Query counts per endpoint of the requests served by this process
+class QueryBudgetStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(query_budget_stats.report())
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0002_event_status"),
+        ("organizations", "0003_organization_kpay_qr_image_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["status", "-created_at", "-id"],
+                name="events_even_status_0ecdcc_idx",
+            ),
+        ),
+    ]
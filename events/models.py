@@ -1,8 +1,34 @@
+from decimal import Decimal
+
 from django.db import models
+from django.db.models import Q, Sum, Value
+from django.db.models.functions import Coalesce
 
-from core.models import AttachableModel, BaseModel
+from core.models import AttachableModel, AttachableQuerySet, BaseModel
 from events.constants import EventStatusChoices
 from organizations.models import Organization
+from transactions.constants import TransactionStatus, TransactionType
+
+
+class EventQuerySet(AttachableQuerySet):
+    def with_progress(self):
+        """
+        Annotate every event with its approved donation total (`current_amount`)
+        in one grouped query for the whole page.
+        """
+        return self.annotate(
+            current_amount=Coalesce(
+                Sum(
+                    "transactions__amount",
+                    filter=Q(
+                        transactions__type=TransactionType.DONATION,
+                        transactions__status=TransactionStatus.APPROVED,
+                    ),
+                ),
+                Value(Decimal("0")),
+                output_field=models.DecimalField(max_digits=14, decimal_places=2),
+            )
+        )
 
 
 class Event(BaseModel, AttachableModel):
@@ -16,10 +42,16 @@ class Event(BaseModel, AttachableModel):
     start_date = models.DateTimeField()
     end_date = models.DateTimeField()
 
+    objects = EventQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Event"
         verbose_name_plural = "Events"
         ordering = ["-created_at"]
+        indexes = [
+            # Keyset pages of the open events feed
+            models.Index(fields=["status", "-created_at", "-id"]),
+        ]
 
     def __str__(self):
         return self.title
@@ -6,19 +6,15 @@ from attachments.models import Attachment
 from attachments.serializers import SimpleAttachmentSerializer
 from events.models import Event
 from organizations.serializers import SimpleOrganizationSerializer
-from transactions.constants import TransactionStatus, TransactionType
-from transactions.models import Transaction
 
 
 class EventSerializer(serializers.ModelSerializer):
     organization = SimpleOrganizationSerializer(read_only=True)
     attachments = SimpleAttachmentSerializer(read_only=True, many=True)
     current_amount = serializers.SerializerMethodField(read_only=True)
-    
+
     uploaded_attachments = serializers.ListField(
-        child=serializers.FileField(),
-        write_only=True,
-        required=False
+        child=serializers.FileField(), write_only=True, required=False
     )
 
     class Meta:
@@ -62,11 +58,15 @@ class EventSerializer(serializers.ModelSerializer):
             return event
 
     def get_current_amount(self, obj):
-        return Transaction.objects.filter(
-            event=obj,
-            type=TransactionType.DONATION,
-            status=TransactionStatus.APPROVED
-        ).aggregate(Sum("amount")).get("amount__sum", 0)
+        # Pages are annotated by the viewsets, single instances are loaded here
+        if not hasattr(obj, "current_amount"):
+            obj.current_amount = (
+                Event.objects.with_progress()
+                .values_list("current_amount", flat=True)
+                .get(pk=obj.pk)
+            )
+        return obj.current_amount
+
 
 class SimpleEventSerializer(serializers.ModelSerializer):
     class Meta:
@@ -0,0 +1,30 @@
+from django.contrib.auth import get_user_model
+
+from notifications.constants import NotificationType
+from notifications.services import notify
+from transactions.constants import TransactionStatus, TransactionType
+
+
+def notify_event_closed(event):
+    """
+    Tell every donor with an approved donation to the event that it has closed
+    """
+    donors = (
+        get_user_model()
+        .objects.filter(
+            transactions__event=event,
+            transactions__type=TransactionType.DONATION,
+            transactions__status=TransactionStatus.APPROVED,
+        )
+        .only("id")
+        .distinct()
+    )
+
+    return notify(
+        donors,
+        source=event.organization,
+        title="Event closed",
+        highlight=event.title,
+        message=f"{event.title} has closed. Thank you for your support!",
+        type=NotificationType.SUCCESS,
+    )
@@ -1 +1,101 @@
-# Create your tests here.
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from core.testing import assertMaxQueries
+from organizations.models import Organization, OrganizationRequest
+from transactions.constants import TransactionStatus, TransactionType
+from transactions.models import Transaction
+
+from .models import Event
+from .views import EventListViewSet, EventViewSet
+
+
+class EventTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create(username="admin")
+        request = OrganizationRequest.objects.create(
+            submitted_by=cls.admin, organization_name="Relief", type="ngo"
+        )
+        cls.organization = Organization.objects.create(
+            admin=cls.admin, name="Relief", type="ngo", organization_request=request
+        )
+        for title in ["Flood", "Fire", "Storm"]:
+            event = Event.objects.create(
+                organization=cls.organization,
+                title=title,
+                description=f"{title} relief",
+                target_amount=1000,
+                start_date=timezone.now(),
+                end_date=timezone.now() + timedelta(days=7),
+            )
+            for status in [TransactionStatus.APPROVED, TransactionStatus.PENDING]:
+                Transaction.objects.create(
+                    organization=cls.organization,
+                    event=event,
+                    actor=cls.admin,
+                    amount=Decimal("25.00"),
+                    type=TransactionType.DONATION,
+                    status=status,
+                )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        # Content types are cached for the life of a worker
+        ContentType.objects.get_for_models(Event, Organization)
+
+
+class EventListQueryTests(EventTestCase):
+    def assert_list_queries(self, url, count):
+        for page_size in [1, 3]:
+            with self.subTest(page_size=page_size), self.assertNumQueries(count):
+                response = self.client.get(url, {"page_size": page_size})
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data["results"]), page_size)
+            for event in response.data["results"]:
+                self.assertEqual(Decimal(event["current_amount"]), Decimal("25.00"))
+
+    def test_organization_events_query_count(self):
+        # Organization lookup, count, the page with its progress and the
+        # attachments of events and organizations
+        self.assert_list_queries(
+            f"/api/organizations/{self.organization.pk}/events/", 5
+        )
+
+    def test_open_events_query_count(self):
+        self.assert_list_queries("/api/events/", 4)
+
+
+class EventQueryBudgetTests(EventTestCase):
+    def assert_within_budget(self, view_class, actions, **kwargs):
+        with self.subTest(view=view_class.__name__, action=actions["get"]):
+            response = assertMaxQueries(
+                view_class.as_view(actions), user=self.admin, **kwargs
+            )
+            self.assertEqual(response.status_code, 200)
+
+    def test_organization_events_stay_within_their_budget(self):
+        event = Event.objects.first()
+        kwargs = {"organization_pk": self.organization.pk}
+
+        self.assert_within_budget(EventViewSet, {"get": "list"}, **kwargs)
+        self.assert_within_budget(
+            EventViewSet, {"get": "retrieve"}, pk=event.pk, **kwargs
+        )
+        self.assert_within_budget(
+            EventViewSet, {"get": "top_donors"}, pk=event.pk, **kwargs
+        )
+
+    def test_open_events_stay_within_their_budget(self):
+        event = Event.objects.first()
+
+        self.assert_within_budget(EventListViewSet, {"get": "list"})
+        self.assert_within_budget(EventListViewSet, {"get": "retrieve"}, pk=event.pk)
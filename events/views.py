@@ -2,33 +2,44 @@ from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets
-from rest_framework.filters import SearchFilter
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
 from core.permissions import IsOrgAdmin
+from core.views import QueryBudgetMixin, ReplicaReadMixin
 from events.constants import EventStatusChoices
 from events.models import Event
 from events.serializers import EventSerializer
+from events.services import notify_event_closed
 from organizations.models import Organization
+from search.filters import IndexedSearchFilter
+from transactions.serializers import DonorTotalSerializer
+from transactions.services import get_top_donors
 
 
-class EventViewSet(viewsets.ModelViewSet):
-    queryset = Event.objects.all()
+class EventViewSet(QueryBudgetMixin, ReplicaReadMixin, viewsets.ModelViewSet):
+    queryset = (
+        Event.objects.with_progress()
+        .select_related("organization")
+        .with_attachments("organization")
+    )
     serializer_class = EventSerializer
     permission_classes = [IsAuthenticated, IsOrgAdmin]
-    filter_backends = [SearchFilter, DjangoFilterBackend]
+    filter_backends = [IndexedSearchFilter, DjangoFilterBackend]
     search_fields = ["title"]
     filterset_fields = ["status"]
     http_method_names = ["get", "patch", "post"]
+    query_budget = {"list": 7, "retrieve": 7, "default": 10}
 
     def get_permissions(self):
-        if self.action == "list":
+        if self.action in ["list", "top_donors"]:
             return [IsAuthenticated()]
         return super().get_permissions()
 
     def get_queryset(self):
         if self.action == "list":
-            return Event.objects.filter(organization=self.kwargs.get("organization_pk"))
+            return self.queryset.filter(organization=self.kwargs.get("organization_pk"))
         return super().get_queryset()
 
     def get_serializer_context(self):
@@ -47,15 +58,37 @@ class EventViewSet(viewsets.ModelViewSet):
             start_date=timezone.now(),
         )
 
+    def perform_update(self, serializer):
+        was_open = serializer.instance.status == EventStatusChoices.OPEN
+        event = serializer.save()
+
+        if was_open and event.status == EventStatusChoices.CLOSED:
+            notify_event_closed(event)
+
+    # Top donors of the event by approved donation total, ?limit= as for organizations
+    @action(detail=True, methods=["get"], url_path="top-donors")
+    def top_donors(self, request, organization_pk=None, pk=None):
+        get_object_or_404(Event.objects.only("id"), pk=pk, organization=organization_pk)
+        donor_totals = get_top_donors(
+            organization_pk, event_id=pk, limit=request.query_params.get("limit")
+        )
+        return Response(DonorTotalSerializer(donor_totals, many=True).data)
+
 
-class EventListViewSet(viewsets.ModelViewSet):
+class EventListViewSet(QueryBudgetMixin, ReplicaReadMixin, viewsets.ModelViewSet):
+    queryset = (
+        Event.objects.with_progress()
+        .select_related("organization")
+        .with_attachments("organization")
+    )
     serializer_class = EventSerializer
     permission_classes = [IsAuthenticated]
     http_method_names = ["get"]
-    filter_backends = [SearchFilter]
+    query_budget = {"list": 7, "retrieve": 5}
+    filter_backends = [IndexedSearchFilter]
     search_fields = ["title"]
 
     def get_queryset(self):
         if self.action == "list":
-            return Event.objects.filter(status=EventStatusChoices.OPEN)
-        return Event.objects.all()
+            return self.queryset.filter(status=EventStatusChoices.OPEN)
+        return self.queryset
@@ -1 +1,6 @@
-# Register your models here.
+from django.contrib import admin
+
+from .models import Notification, NotificationCounter
+
+admin.site.register(Notification)
+admin.site.register(NotificationCounter)
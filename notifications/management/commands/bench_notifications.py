@@ -0,0 +1,54 @@
+import time
+from uuid import uuid4
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import TestCase
+
+from notifications.services import notify
+from organizations.models import Organization
+
+
+class Command(BaseCommand):
+    help = "Time a notify() fan-out (insert, counters, dispatch on commit) without keeping the rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--recipients", type=int, default=10000)
+
+    def handle(self, *args, **options):
+        source = Organization.objects.first()
+        if source is None:
+            raise CommandError(
+                "Create an organization first, it is the notification source."
+            )
+
+        User = get_user_model()
+        # Receivers only need a primary key, nothing is written for them
+        receivers = [User(id=uuid4()) for _ in range(options["recipients"])]
+        timings = {}
+
+        with transaction.atomic():
+            # on_commit callbacks are collected instead of waiting for a commit
+            # that never comes, then run like the commit would run them
+            with TestCase.captureOnCommitCallbacks() as callbacks:
+                started = time.perf_counter()
+                notify(receivers, source, "Benchmark", "Benchmark notification")
+                timings["notify"] = time.perf_counter() - started
+
+            started = time.perf_counter()
+            for callback in callbacks:
+                callback()
+            timings["dispatch"] = time.perf_counter() - started
+
+            transaction.set_rollback(True)
+
+        for step, elapsed in timings.items():
+            self.stdout.write(f"{step:>10}: {elapsed * 1000:8.1f} ms")
+        total = sum(timings.values())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ {len(receivers)} notifications in {total:.2f}s "
+                f"({len(receivers) / total:.0f}/s)"
+            )
+        )
@@ -0,0 +1,84 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_counters(apps, schema_editor):
+    Notification = apps.get_model("notifications", "Notification")
+    NotificationCounter = apps.get_model("notifications", "NotificationCounter")
+
+    receivers = (
+        Notification.objects.filter(is_read=False)
+        .order_by()
+        .values("receiver_content_type", "receiver_object_id")
+        .annotate(unread=Count("id"))
+    )
+    NotificationCounter.objects.bulk_create(
+        NotificationCounter(
+            receiver_content_type_id=receiver["receiver_content_type"],
+            receiver_object_id=receiver["receiver_object_id"],
+            unread_count=receiver["unread"],
+        )
+        for receiver in receivers
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("notifications", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("receiver_object_id", models.UUIDField()),
+                ("unread_count", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Notification Counter",
+                "verbose_name_plural": "Notification Counters",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                fields=[
+                    "receiver_content_type",
+                    "receiver_object_id",
+                    "-created_at",
+                    "-id",
+                ],
+                name="notificatio_receive_1f7b42_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="notificationcounter",
+            name="receiver_content_type",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                to="contenttypes.contenttype",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="notificationcounter",
+            constraint=models.UniqueConstraint(
+                fields=("receiver_content_type", "receiver_object_id"),
+                name="unique_notification_counter_receiver",
+            ),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
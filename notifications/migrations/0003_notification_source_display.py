@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notifications", "0002_notification_inbox"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notification",
+            name="source_display",
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
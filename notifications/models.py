@@ -18,6 +18,9 @@ class Notification(BaseModel):
     )
     source_object_id = models.UUIDField()
     source_object = GenericForeignKey("source_content_type", "source_object_id")
+    # Rendered source taken when the notification is created, so inbox pages
+    # need no lookups (it keeps the source's name as it was at that time)
+    source_display = models.JSONField(null=True, blank=True)
     title = models.CharField(max_length=255)
     highlight = models.CharField(max_length=255, null=True, blank=True)
     message = models.CharField(max_length=255)
@@ -35,3 +38,41 @@ class Notification(BaseModel):
         verbose_name = "Notification"
         verbose_name_plural = "Notifications"
         ordering = ["-created_at"]
+        indexes = [
+            # Keyset pages of a receiver's inbox
+            models.Index(
+                fields=[
+                    "receiver_content_type",
+                    "receiver_object_id",
+                    "-created_at",
+                    "-id",
+                ]
+            ),
+        ]
+
+
+class NotificationCounter(models.Model):
+    """
+    Unread notifications of a receiver, incremented when notifications are
+    created and decremented when they are read, so badge polling reads one row
+    instead of counting the inbox.
+    """
+
+    receiver_content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    receiver_object_id = models.UUIDField()
+    receiver_object = GenericForeignKey("receiver_content_type", "receiver_object_id")
+    unread_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Notification Counter"
+        verbose_name_plural = "Notification Counters"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["receiver_content_type", "receiver_object_id"],
+                name="unique_notification_counter_receiver",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.receiver_object} - {self.unread_count} unread"
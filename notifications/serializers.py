@@ -1,10 +1,85 @@
+from collections import defaultdict
+
 from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
 from rest_framework import serializers
 
 from organizations.models import Organization
 
 from .models import Notification
 
+# Columns loaded for each kind of source, anything else only needs its pk
+SOURCE_FIELDS = {
+    "organizations.organization": ["id", "name"],
+    "accounts.user": ["id", "username"],
+}
+
+
+def get_source_display(source):
+    if source is None:
+        return None
+
+    if isinstance(source, Organization):
+        return {
+            "type": "organization",
+            "id": str(source.pk),
+            "name": source.name,
+        }
+    elif isinstance(source, get_user_model()):
+        return {
+            "type": "user",
+            "id": str(source.pk),
+            "username": source.username,
+        }
+
+    return str(source)
+
+
+def resolve_source_objects(notifications):
+    """
+    Load the sources of the notifications without a `source_display` snapshot
+    with one `in_bulk` query per source type, and cache them on the
+    notifications so `source_object` needs no further lookups
+    """
+    source_object = Notification._meta.get_field("source_object")
+    ids_by_content_type = defaultdict(set)
+    for notification in notifications:
+        if notification.source_display is None and not source_object.is_cached(
+            notification
+        ):
+            ids_by_content_type[notification.source_content_type_id].add(
+                notification.source_object_id
+            )
+
+    sources = {}
+    for content_type_id, ids in ids_by_content_type.items():
+        content_type = ContentType.objects.get_for_id(content_type_id)
+        model = content_type.model_class()
+        if model is None:
+            continue
+
+        queryset = model._base_manager.all()
+        fields = SOURCE_FIELDS.get(model._meta.label_lower)
+        if fields is not None:
+            queryset = queryset.only(*fields)
+        sources[content_type_id] = queryset.in_bulk(ids)
+
+    for notification in notifications:
+        if notification.source_content_type_id in sources:
+            source_object.set_cached_value(
+                notification,
+                sources[notification.source_content_type_id].get(
+                    notification.source_object_id
+                ),
+            )
+
+
+class NotificationListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        notifications = list(data.all() if hasattr(data, "all") else data)
+        resolve_source_objects(notifications)
+        return super().to_representation(notifications)
+
 
 class NotificationReadSerializer(serializers.ModelSerializer):
     class Meta:
@@ -18,24 +93,19 @@ class NotificationReadSerializer(serializers.ModelSerializer):
             "is_read",
             "source_object",
         ]
+        list_serializer_class = NotificationListSerializer
 
     source_object = serializers.SerializerMethodField()
 
     def get_source_object(self, obj):
-        if not obj.source_object:
-            return None
-
-        if isinstance(obj.source_object, Organization):
-            return {
-                "type": "organization",
-                "id": str(obj.source_object.pk),
-                "name": obj.source_object.name,
-            }
-        elif isinstance(obj.source_object, get_user_model()):
-            return {
-                "type": "user",
-                "id": str(obj.source_object.pk),
-                "username": obj.source_object.username,
-            }
-
-        return str(obj.source_object)
+        if obj.source_display is not None:
+            return obj.source_display
+
+        return get_source_display(obj.source_object)
+
+
+class MarkNotificationsReadSerializer(serializers.Serializer):
+    # Leave out to mark the whole inbox as read
+    ids = serializers.ListField(
+        child=serializers.UUIDField(), required=False, max_length=1000
+    )
@@ -1,17 +1,156 @@
+import asyncio
+from collections import Counter
+
 from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
 
-from .serializers import NotificationReadSerializer
+from .constants import NotificationType
+from .models import Notification, NotificationCounter
+from .serializers import NotificationReadSerializer, get_source_display
 
+# group_send calls awaited together, bounds the in-flight sends of large fan-outs
+DISPATCH_BATCH_SIZE = 500
 
-def send_notification_to_user(notification):
+
+def get_group_name(receiver_object_id):
+    # Must match the consumer's group name
+    return f"user_{receiver_object_id}"
+
+
+async def dispatch_notifications(messages):
     channel_layer = get_channel_layer()
-    group_name = f"user_{notification.receiver_object_id}"  # Must match the consumer's group name
-
-    async_to_sync(channel_layer.group_send)(
-        group_name,
-        {
-            "type": "send_notification",  # Must match the consumer method
-            "notification": NotificationReadSerializer(notification),
-        },
+    for start in range(0, len(messages), DISPATCH_BATCH_SIZE):
+        await asyncio.gather(
+            *(
+                channel_layer.group_send(group_name, message)
+                for group_name, message in messages[start : start + DISPATCH_BATCH_SIZE]
+            )
+        )
+
+
+def send_notifications(notifications):
+    """
+    Push already saved notifications to their receivers. Payloads are serialized
+    once, to plain data, and sent in one async batch.
+    """
+    payloads = NotificationReadSerializer(notifications, many=True).data
+    messages = [
+        (
+            get_group_name(notification.receiver_object_id),
+            {
+                "type": "send_notification",  # Must match the consumer method
+                "notification": payload,
+            },
+        )
+        for notification, payload in zip(notifications, payloads)
+    ]
+    async_to_sync(dispatch_notifications)(messages)
+
+
+def send_notification_to_user(notification):
+    send_notifications([notification])
+
+
+def notify(
+    receivers, source, title, message, highlight=None, type=NotificationType.INFO
+):
+    """
+    Create the same notification for many receivers (e.g. every donor of an
+    event) with one bulk INSERT, then push them all once the data is committed.
+    """
+    source_display = get_source_display(source)
+    notifications = Notification.objects.bulk_create(
+        [
+            Notification(
+                receiver_object=receiver,
+                source_object=source,
+                source_display=source_display,
+                title=title,
+                highlight=highlight,
+                message=message,
+                type=type,
+            )
+            for receiver in receivers
+        ],
+        batch_size=1000,
     )
+
+    increment_unread_counts(notifications)
+    transaction.on_commit(lambda: send_notifications(notifications))
+    return notifications
+
+
+def get_receiver_filter(receiver):
+    return {
+        "receiver_content_type": ContentType.objects.get_for_model(receiver),
+        "receiver_object_id": receiver.pk,
+    }
+
+
+def increment_unread_counts(notifications):
+    """
+    Add unread notifications to their receivers' counters, one UPDATE per
+    receiver instead of one per notification
+    """
+    counts = Counter(
+        (notification.receiver_content_type_id, notification.receiver_object_id)
+        for notification in notifications
+        if not notification.is_read
+    )
+
+    for (content_type_id, object_id), count in counts.items():
+        receiver_filter = {
+            "receiver_content_type_id": content_type_id,
+            "receiver_object_id": object_id,
+        }
+        updated = NotificationCounter.objects.filter(**receiver_filter).update(
+            unread_count=F("unread_count") + count
+        )
+        if updated:
+            continue
+
+        _, created = NotificationCounter.objects.get_or_create(
+            **receiver_filter, defaults={"unread_count": count}
+        )
+        if not created:
+            # Created concurrently since the UPDATE above
+            NotificationCounter.objects.filter(**receiver_filter).update(
+                unread_count=F("unread_count") + count
+            )
+
+
+def decrement_unread_count(receiver_filter, count):
+    if count:
+        NotificationCounter.objects.filter(**receiver_filter).update(
+            unread_count=Greatest(F("unread_count") - count, Value(0))
+        )
+
+
+def get_unread_count(receiver):
+    return (
+        NotificationCounter.objects.filter(**get_receiver_filter(receiver))
+        .values_list("unread_count", flat=True)
+        .first()
+        or 0
+    )
+
+
+def mark_notifications_read(receiver, ids=None):
+    """
+    Mark the receiver's unread notifications (all of them, or only `ids`) as
+    read with a single UPDATE and take them off the unread counter.
+    """
+    receiver_filter = get_receiver_filter(receiver)
+    notifications = Notification.objects.filter(**receiver_filter, is_read=False)
+    if ids is not None:
+        notifications = notifications.filter(id__in=ids)
+
+    with transaction.atomic():
+        updated = notifications.update(is_read=True)
+        decrement_unread_count(receiver_filter, updated)
+
+    return updated
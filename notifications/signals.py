@@ -0,0 +1,46 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Notification
+from .services import decrement_unread_count, increment_unread_counts
+
+
+def get_receiver_filter(instance):
+    return {
+        "receiver_content_type_id": instance.receiver_content_type_id,
+        "receiver_object_id": instance.receiver_object_id,
+    }
+
+
+# Bulk paths (notify, mark_notifications_read) keep the counters in sync
+# themselves, these only cover notifications saved one by one
+@receiver(pre_save, sender=Notification)
+def remember_previous_is_read(sender, instance, **kwargs):
+    instance._previous_is_read = None
+    if instance._state.adding:
+        return
+
+    instance._previous_is_read = (
+        Notification.objects.filter(pk=instance.pk)
+        .values_list("is_read", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Notification)
+def update_unread_count_on_save(sender, instance, created, **kwargs):
+    if created:
+        increment_unread_counts([instance])
+        return
+
+    previous = getattr(instance, "_previous_is_read", None)
+    if previous is False and instance.is_read:
+        decrement_unread_count(get_receiver_filter(instance), 1)
+    elif previous is True and not instance.is_read:
+        increment_unread_counts([instance])
+
+
+@receiver(post_delete, sender=Notification)
+def update_unread_count_on_delete(sender, instance, **kwargs):
+    if not instance.is_read:
+        decrement_unread_count(get_receiver_filter(instance), 1)
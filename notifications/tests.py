@@ -1 +1,206 @@
-# Create your tests here.
+import json
+from unittest import mock
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from core.testing import assertMaxQueries
+from organizations.models import Organization, OrganizationRequest
+
+from .models import Notification, NotificationCounter
+from .serializers import NotificationReadSerializer, get_source_display
+from .services import get_unread_count, notify
+from .views import NotificationViewSet
+
+
+class NotificationTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="donor")
+        cls.other = User.objects.create(username="other")
+        request = OrganizationRequest.objects.create(
+            submitted_by=cls.user, organization_name="Relief", type="ngo"
+        )
+        cls.organization = Organization.objects.create(
+            admin=cls.user, name="Relief", type="ngo", organization_request=request
+        )
+        for title in ["Thanks", "Event closed", "New activity"]:
+            notify([cls.user, cls.other], cls.organization, title, f"{title} message")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+
+class NotificationQueryBudgetTests(NotificationTestCase):
+    def test_inbox_stays_within_its_budget(self):
+        for params in [{}, {"is_read": "false"}]:
+            with self.subTest(params=params):
+                response = assertMaxQueries(
+                    NotificationViewSet.as_view({"get": "list"}),
+                    user=self.user,
+                    data=params,
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.data["results"]), 3)
+
+
+class NotifyTests(NotificationTestCase):
+    def test_notify_creates_one_row_per_receiver(self):
+        before = Notification.objects.count()
+
+        notify([self.user, self.other], self.organization, "Hello", "Hello message")
+
+        self.assertEqual(Notification.objects.count(), before + 2)
+        for receiver in [self.user, self.other]:
+            notification = Notification.objects.get(
+                receiver_object_id=receiver.pk, title="Hello"
+            )
+            self.assertEqual(
+                notification.source_display, get_source_display(self.organization)
+            )
+
+    @mock.patch("notifications.services.dispatch_notifications")
+    def test_payloads_are_dispatched_after_commit(self, dispatch):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            notify([self.user, self.other], self.organization, "Hello", "Hello")
+            dispatch.assert_not_called()
+
+        self.assertEqual(len(callbacks), 1)
+        dispatch.assert_called_once()
+        (messages,) = dispatch.call_args.args
+        self.assertEqual(len(messages), 2)
+        for _group, message in messages:
+            self.assertEqual(message["type"], "send_notification")
+            json.dumps(message)
+
+
+class SourceResolutionTests(NotificationTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        notify([cls.user], cls.other, "Followed", "Followed message")
+        request = OrganizationRequest.objects.create(
+            submitted_by=cls.other, organization_name="Shelter", type="ngo"
+        )
+        closed = Organization.objects.create(
+            admin=cls.other, name="Shelter", type="ngo", organization_request=request
+        )
+        notify([cls.user], closed, "Closed", "Closed message")
+        closed.delete()
+        # Notifications created before sources were snapshotted
+        Notification.objects.update(source_display=None)
+
+    def setUp(self):
+        super().setUp()
+        # Content types are cached for the life of a worker
+        ContentType.objects.get_for_models(Organization, User)
+
+    def serialize(self):
+        notifications = list(
+            Notification.objects.filter(receiver_object_id=self.user.pk)
+        )
+        # One query per source type, whatever the size of the page
+        with self.assertNumQueries(2):
+            data = NotificationReadSerializer(notifications, many=True).data
+        return {item["title"]: item["source_object"] for item in data}
+
+    def test_sources_are_loaded_once_per_type(self):
+        sources = self.serialize()
+
+        self.assertEqual(len(sources), 5)
+        self.assertEqual(sources["Thanks"]["name"], "relief")
+        self.assertEqual(sources["Followed"]["username"], "other")
+
+    def test_deleted_source_is_null(self):
+        self.assertIsNone(self.serialize()["Closed"])
+
+
+class NotificationCounterTests(NotificationTestCase):
+    def get_notification(self, user=None):
+        return Notification.objects.filter(
+            receiver_object_id=(user or self.user).pk
+        ).first()
+
+    def mark_read(self, data):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                "/api/notifications/mark-read/", data, format="json"
+            )
+
+        self.assertEqual(response.status_code, 200)
+        updates = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith('UPDATE "notifications_notification"')
+        ]
+        self.assertEqual(len(updates), 1)
+        return response
+
+    def test_notify_counts_new_notifications(self):
+        self.assertEqual(get_unread_count(self.user), 3)
+
+        notify([self.user], self.organization, "Again", "Again message")
+
+        self.assertEqual(get_unread_count(self.user), 4)
+        self.assertEqual(get_unread_count(self.other), 3)
+
+    def test_unread_count_reads_the_counter(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/notifications/unread-count/")
+
+        self.assertEqual(response.data, {"unread_count": 3})
+        self.assertFalse(
+            any("COUNT(" in query["sql"] for query in queries.captured_queries)
+        )
+
+    def test_mark_all_read(self):
+        response = self.mark_read({})
+
+        self.assertEqual(response.data, {"updated": 3, "unread_count": 0})
+        self.assertEqual(get_unread_count(self.other), 3)
+        self.assertFalse(
+            Notification.objects.filter(
+                receiver_object_id=self.other.pk, is_read=True
+            ).exists()
+        )
+
+    def test_mark_some_read(self):
+        notification = self.get_notification()
+        other_notification = self.get_notification(self.other)
+
+        response = self.mark_read(
+            {"ids": [str(notification.pk), str(other_notification.pk)]}
+        )
+
+        self.assertEqual(response.data, {"updated": 1, "unread_count": 2})
+        other_notification.refresh_from_db()
+        self.assertFalse(other_notification.is_read)
+        self.assertEqual(get_unread_count(self.other), 3)
+
+    def test_reading_and_deleting_one_notification(self):
+        notification = self.get_notification()
+        notification.is_read = True
+        notification.save()
+        self.assertEqual(get_unread_count(self.user), 2)
+
+        # Read notifications are no longer counted
+        notification.delete()
+        self.assertEqual(get_unread_count(self.user), 2)
+
+        self.get_notification().delete()
+        self.assertEqual(get_unread_count(self.user), 1)
+
+    def test_count_never_goes_below_zero(self):
+        NotificationCounter.objects.filter(receiver_object_id=self.user.pk).update(
+            unread_count=0
+        )
+
+        self.get_notification().delete()
+        self.mark_read({})
+
+        self.assertEqual(get_unread_count(self.user), 0)
@@ -0,0 +1,8 @@
+from rest_framework_nested import routers
+
+from .views import NotificationViewSet
+
+router = routers.DefaultRouter()
+router.register(r"notifications", NotificationViewSet, basename="notifications")
+
+urlpatterns = router.urls
@@ -1 +1,47 @@
-# Create your views here.
+from rest_framework import mixins, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from core.paginations import KeysetPagination
+from core.views import QueryBudgetMixin
+
+from .models import Notification
+from .serializers import MarkNotificationsReadSerializer, NotificationReadSerializer
+from .services import get_receiver_filter, get_unread_count, mark_notifications_read
+
+
+class NotificationViewSet(
+    QueryBudgetMixin, mixins.ListModelMixin, viewsets.GenericViewSet
+):
+    serializer_class = NotificationReadSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    query_budget = 4
+
+    def get_queryset(self):
+        queryset = Notification.objects.filter(**get_receiver_filter(self.request.user))
+
+        # ?is_read=false lists only the unread ones
+        is_read = self.request.query_params.get("is_read")
+        if is_read in ("true", "false"):
+            queryset = queryset.filter(is_read=is_read == "true")
+
+        return queryset
+
+    # Badge count, read from the counter row instead of counting the inbox
+    @action(detail=False, methods=["get"], url_path="unread-count")
+    def unread_count(self, request):
+        return Response({"unread_count": get_unread_count(request.user)})
+
+    @action(detail=False, methods=["post"], url_path="mark-read")
+    def mark_read(self, request):
+        serializer = MarkNotificationsReadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        updated = mark_notifications_read(
+            request.user, ids=serializer.validated_data.get("ids")
+        )
+        return Response(
+            {"updated": updated, "unread_count": get_unread_count(request.user)}
+        )
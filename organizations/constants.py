@@ -5,3 +5,9 @@ class OrganizationRequestStatus(models.TextChoices):
     PENDING = "pending", "Pending"
     APPROVED = "approved", "Approved"
     REJECTED = "rejected", "Rejected"
+
+
+class KpayQrStatus(models.TextChoices):
+    PENDING = "pending", "Pending"
+    DECODED = "decoded", "Decoded"
+    FAILED = "failed", "Failed"
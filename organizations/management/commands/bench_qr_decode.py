@@ -0,0 +1,67 @@
+import io
+import statistics
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from PIL import Image
+
+from organizations.utils import decode_qr_image
+
+
+class Command(BaseCommand):
+    help = "Measure KPay QR decode latency for a range of image and decode sizes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--image",
+            action="append",
+            default=[],
+            help="Image to decode (repeatable). Without one, synthetic photos are used.",
+        )
+        parser.add_argument(
+            "--max-size",
+            type=int,
+            action="append",
+            help="Decode size to measure (repeatable), 0 decodes at full size.",
+        )
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        max_sizes = options["max_size"] or [512, 1024, 2048, 0]
+        images = [(path, Path(path).read_bytes()) for path in options["image"]]
+        if not images:
+            images = [
+                (f"synthetic {width}x{height}", self.make_photo(width, height))
+                for width, height in [(960, 1280), (1920, 2560), (3024, 4032)]
+            ]
+
+        for name, data in images:
+            with Image.open(io.BytesIO(data)) as image:
+                size = "x".join(map(str, image.size))
+            self.stdout.write(
+                self.style.NOTICE(f"{name} ({size}, {len(data) // 1024} KB)")
+            )
+
+            for max_size in max_sizes:
+                timings = []
+                for _ in range(options["repeat"]):
+                    started = time.perf_counter()
+                    result = decode_qr_image(data, max_size or 100_000)
+                    timings.append((time.perf_counter() - started) * 1000)
+
+                label = f"max {max_size}px" if max_size else "full size"
+                self.stdout.write(
+                    f"  {label:>12}: median {statistics.median(timings):7.1f} ms, "
+                    f"min {min(timings):7.1f} ms, "
+                    f"{'found' if result else 'no code'}"
+                )
+
+        self.stdout.write(self.style.SUCCESS("✅ Done"))
+
+    def make_photo(self, width, height):
+        buffer = io.BytesIO()
+        Image.effect_noise((width, height), 40).convert("RGB").save(
+            buffer, "JPEG", quality=90
+        )
+        return buffer.getvalue()
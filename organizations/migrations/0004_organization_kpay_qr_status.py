@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:18
+
+from django.db import migrations, models
+
+
+def mark_decoded_urls(apps, schema_editor):
+    Organization = apps.get_model("organizations", "Organization")
+    Organization.objects.filter(kpay_qr_url__isnull=False).update(
+        kpay_qr_status="decoded"
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("organizations", "0003_organization_kpay_qr_image_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="organization",
+            name="kpay_qr_status",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("pending", "Pending"),
+                    ("decoded", "Decoded"),
+                    ("failed", "Failed"),
+                ],
+                max_length=20,
+                null=True,
+            ),
+        ),
+        migrations.RunPython(mark_decoded_urls, migrations.RunPython.noop),
+    ]
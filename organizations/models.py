@@ -1,9 +1,11 @@
 from django.conf import settings
 from django.db import models
+from django.db.models import Count, Q, Sum
 
-from core.models import AttachableModel, BaseModel
+from core.models import AttachableModel, AttachableQuerySet, BaseModel
+from transactions.constants import TransactionStatus, TransactionType
 
-from .constants import OrganizationRequestStatus
+from .constants import KpayQrStatus, OrganizationRequestStatus
 
 
 class OrganizationRequest(BaseModel, AttachableModel):
@@ -44,6 +46,30 @@ class OrganizationRequest(BaseModel, AttachableModel):
         ordering = ["-created_at"]
 
 
+class OrganizationQuerySet(AttachableQuerySet):
+    def with_stats(self):
+        """
+        Annotate every organization with its transaction totals in a single
+        grouped query instead of one aggregate per field and row.
+        """
+        donation = Q(transactions__type=TransactionType.DONATION)
+        approved_donation = donation & Q(
+            transactions__status=TransactionStatus.APPROVED
+        )
+
+        return self.annotate(
+            stats_received=Sum("transactions__amount", filter=donation),
+            stats_expense=Sum(
+                "transactions__amount",
+                filter=Q(transactions__type=TransactionType.DISBURSEMENT),
+            ),
+            stats_donors=Count(
+                "transactions__actor", filter=approved_donation, distinct=True
+            ),
+            stats_donations=Count("transactions", filter=approved_donation),
+        )
+
+
 class Organization(BaseModel, AttachableModel):
     admin = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -54,6 +80,10 @@ class Organization(BaseModel, AttachableModel):
     type = models.CharField(max_length=50)
     kpay_qr_url = models.URLField(null=True, blank=True)
     kpay_qr_image = models.ImageField(upload_to="kpay_qr_images", null=True, blank=True)
+    # Decoding of kpay_qr_image into kpay_qr_url, null until an image is uploaded
+    kpay_qr_status = models.CharField(
+        max_length=20, choices=KpayQrStatus.choices, null=True, blank=True
+    )
     description = models.TextField(null=True, blank=True)
     phone_number = models.CharField(max_length=20, null=True, blank=True)
     email = models.EmailField(null=True, blank=True)
@@ -63,6 +93,8 @@ class Organization(BaseModel, AttachableModel):
     )
     # attachments field will store a profile picture or logo of the organization
 
+    objects = OrganizationQuerySet.as_manager()
+
     def __str__(self):
         return self.name
 
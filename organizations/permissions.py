@@ -62,6 +62,14 @@ class IsAdminOrOrgAdmin(permissions.BasePermission):
         return False
 
 
+class IsAdminOrOwnOrgAdmin(permissions.BasePermission):
+    # Staff or the admin of the organization, for reads too
+    def has_object_permission(self, request, view, obj):
+        return bool(request.user and request.user.is_staff) or (
+            obj.admin_id == request.user.pk
+        )
+
+
 class IsOrgAdmin(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         organization = view.kwargs.get("organization_id")
@@ -1,18 +1,18 @@
 from django.contrib.auth import get_user_model
 from django.db import transaction
-from django.db.models import Sum
 from rest_framework import serializers, status
 
 from attachments.models import Attachment
 from attachments.serializers import SimpleAttachmentSerializer
-from transactions.constants import TransactionStatus, TransactionType
+from transactions.models import OrganizationLedger
 
 from .constants import OrganizationRequestStatus
 from .models import Organization, OrganizationRequest
-from .utils import extract_qr_url
+from .services import schedule_qr_decode
 
 User = get_user_model()
 
+
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -88,6 +88,16 @@ class OrganizationRequestSerializer(serializers.ModelSerializer):
         ]
 
 
+def get_organization_ledger(obj):
+    """
+    Running totals of the organization, an empty ledger if nothing was recorded yet
+    """
+    try:
+        return obj.ledger
+    except OrganizationLedger.DoesNotExist:
+        return OrganizationLedger(organization=obj)
+
+
 class OrganizationStatsSerializer(serializers.ModelSerializer):
     total_received_money = serializers.SerializerMethodField(read_only=True)
     total_expense = serializers.SerializerMethodField(read_only=True)
@@ -98,20 +108,10 @@ class OrganizationStatsSerializer(serializers.ModelSerializer):
         fields = ["total_received_money", "total_expense", "total_current_balance"]
 
     def get_total_received_money(self, obj):
-        return (
-            obj.transactions.filter(type=TransactionType.DONATION).aggregate(
-                total=Sum("amount")
-            )["total"]
-            or 0
-        )
+        return get_organization_ledger(obj).donation_total or 0
 
     def get_total_expense(self, obj):
-        return (
-            obj.transactions.filter(type=TransactionType.DISBURSEMENT).aggregate(
-                total=Sum("amount")
-            )["total"]
-            or 0
-        )
+        return get_organization_ledger(obj).disbursement_total or 0
 
     def get_total_current_balance(self, obj):
         total_received = self.get_total_received_money(obj)
@@ -140,19 +140,10 @@ class OrganizationSerializer(serializers.ModelSerializer):
         return SimpleAttachmentSerializer(obj.attachments.all(), many=True).data
 
     def get_total_donors(self, obj):
-        return (
-            obj.transactions.filter(
-                type=TransactionType.DONATION, status=TransactionStatus.APPROVED
-            )
-            .values("actor")
-            .distinct()
-            .count()
-        )
+        return get_organization_ledger(obj).donor_count
 
     def get_total_donations(self, obj):
-        return obj.transactions.filter(
-            type=TransactionType.DONATION, status=TransactionStatus.APPROVED
-        ).count()
+        return get_organization_ledger(obj).donation_count
 
     class Meta:
         model = Organization
@@ -171,6 +162,7 @@ class OrganizationSerializer(serializers.ModelSerializer):
             "updated_at",
             "attachments",
             "kpay_qr_image",
+            "kpay_qr_status",
             "uploaded_attachments",
             "stats",
             "total_donations",
@@ -183,6 +175,7 @@ class OrganizationSerializer(serializers.ModelSerializer):
             "updated_at",
             "stats",
             "kpay_qr_url",
+            "kpay_qr_status",
         ]
 
     def update(self, instance, validated_data):
@@ -203,11 +196,9 @@ class OrganizationSerializer(serializers.ModelSerializer):
                     if file:
                         Attachment.objects.create(content_object=instance, file=file)
 
+            # Decoded off the request thread, clients poll kpay_qr_status
             if qr_code_file:
-                print("hello")
-                qr_code_url = extract_qr_url(qr_code_file)
-                print(qr_code_url)
-                instance.kpay_qr_url = qr_code_url
+                schedule_qr_decode(instance, qr_code_file)
 
             instance.save()
 
@@ -0,0 +1,129 @@
+import hashlib
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+
+from .constants import KpayQrStatus
+from .models import Organization
+from .utils import decode_qr_image
+
+logger = logging.getLogger(__name__)
+
+QR_CACHE_TIMEOUT = 60 * 60 * 24 * 30
+
+qr_executor = None
+qr_executor_lock = threading.Lock()
+
+
+def get_qr_executor():
+    # Created on first use, so only processes that decode QR codes start workers
+    global qr_executor
+    with qr_executor_lock:
+        if qr_executor is None:
+            qr_executor = ProcessPoolExecutor(
+                max_workers=getattr(settings, "KPAY_QR_DECODE_WORKERS", 2),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return qr_executor
+
+
+def reset_qr_executor(executor):
+    # A worker that died (e.g. killed for memory) breaks the whole pool: replace
+    # it, unless another thread already did
+    global qr_executor
+    with qr_executor_lock:
+        if qr_executor is executor:
+            qr_executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_qr_cache_key(image_hash):
+    return f"kpay_qr:{image_hash}"
+
+
+def store_qr_result(organization_id, image_name, qr_url):
+    # Ignored when another image was uploaded since this one was submitted
+    Organization.objects.filter(
+        pk=organization_id,
+        kpay_qr_image=image_name,
+        kpay_qr_status=KpayQrStatus.PENDING,
+    ).update(
+        kpay_qr_url=qr_url,
+        kpay_qr_status=KpayQrStatus.DECODED if qr_url else KpayQrStatus.FAILED,
+    )
+
+
+def on_qr_decoded(organization_id, image_name, image_hash, future):
+    try:
+        qr_url = future.result()
+        cache.set(get_qr_cache_key(image_hash), qr_url or "", QR_CACHE_TIMEOUT)
+        store_qr_result(organization_id, image_name, qr_url)
+    except Exception:
+        logger.exception("Could not decode the KPay QR of %s", organization_id)
+        store_qr_result(organization_id, image_name, None)
+    finally:
+        connections.close_all()
+
+
+def start_qr_decode(data):
+    executor = get_qr_executor()
+    try:
+        return executor.submit(
+            decode_qr_image,
+            data,
+            getattr(settings, "KPAY_QR_DECODE_MAX_SIZE", 1024),
+        )
+    except BrokenProcessPool:
+        reset_qr_executor(executor)
+        raise
+
+
+def submit_qr_decode(organization_id, image_name, image_hash, data):
+    # Runs in on_commit: an error here would leave the organization pending
+    try:
+        try:
+            future = start_qr_decode(data)
+        except BrokenProcessPool:
+            # Retried once on the fresh pool
+            future = start_qr_decode(data)
+    except Exception:
+        logger.exception("Could not submit the KPay QR of %s", organization_id)
+        store_qr_result(organization_id, image_name, None)
+        return
+
+    future.add_done_callback(
+        lambda future: on_qr_decoded(organization_id, image_name, image_hash, future)
+    )
+
+
+def schedule_qr_decode(organization, file):
+    """
+    Set `kpay_qr_url` and `kpay_qr_status` of an organization whose KPay QR
+    image is being replaced by `file`. Images decoded before are answered from
+    the cache, others are decoded by the QR worker processes once the
+    organization is saved, while clients poll `kpay_qr_status`.
+    """
+    data = file.read()
+    file.seek(0)
+    image_hash = hashlib.sha256(data).hexdigest()
+
+    qr_url = cache.get(get_qr_cache_key(image_hash))
+    if qr_url is not None:
+        organization.kpay_qr_url = qr_url or None
+        organization.kpay_qr_status = (
+            KpayQrStatus.DECODED if qr_url else KpayQrStatus.FAILED
+        )
+        return
+
+    organization.kpay_qr_status = KpayQrStatus.PENDING
+    transaction.on_commit(
+        lambda: submit_qr_decode(
+            organization.pk, organization.kpay_qr_image.name, image_hash, data
+        )
+    )
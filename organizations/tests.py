@@ -1 +1,166 @@
-# Create your tests here.
+import base64
+import json
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from core.testing import assertMaxQueries
+
+from . import services
+from .constants import KpayQrStatus
+from .models import Organization, OrganizationRequest
+from .views import OrganizationViewSet
+
+
+def make_cursor(payload):
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+class OrganizationTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create(username="admin", is_staff=True)
+        for name in ["Relief", "Shelter", "Water"]:
+            request = OrganizationRequest.objects.create(
+                submitted_by=cls.admin, organization_name=name, type="ngo"
+            )
+            Organization.objects.create(
+                admin=cls.admin, name=name, type="ngo", organization_request=request
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+
+class OrganizationListQueryTests(OrganizationTestCase):
+    def setUp(self):
+        super().setUp()
+        # Content types are cached for the life of a worker
+        ContentType.objects.get_for_models(Organization, OrganizationRequest)
+
+    def test_list_query_count(self):
+        # Count, the page with its stats and the attachments of both models
+        with self.assertNumQueries(4):
+            response = self.client.get("/api/organizations/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 3)
+
+    def test_list_query_count_does_not_grow_with_the_page(self):
+        with self.assertNumQueries(4):
+            self.client.get("/api/organizations/?page_size=1")
+
+
+class OrganizationCursorTests(OrganizationTestCase):
+    def test_pages_follow_the_cursor(self):
+        response = self.client.get("/api/organizations/?pagination=keyset&page_size=2")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 2)
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [item["name"] for item in response.data["results"]], ["relief"]
+        )
+
+    def test_tampered_cursor_is_not_found(self):
+        for payload in [{"p": ["x", "y"]}, {"p": [1, {}]}, {"p": "x"}]:
+            with self.subTest(payload=payload):
+                response = self.client.get(
+                    "/api/organizations/", {"cursor": make_cursor(payload)}
+                )
+                self.assertEqual(response.status_code, 404)
+
+    def test_garbage_cursor_is_not_found(self):
+        response = self.client.get("/api/organizations/", {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, 404)
+
+
+class QrDecodeSubmitTests(OrganizationTestCase):
+    def setUp(self):
+        super().setUp()
+        self.organization = Organization.objects.get(name="relief")
+        Organization.objects.filter(pk=self.organization.pk).update(
+            kpay_qr_image="qr.png", kpay_qr_status=KpayQrStatus.PENDING
+        )
+
+    def submit(self, *executors):
+        with mock.patch.object(services, "get_qr_executor", side_effect=executors):
+            services.submit_qr_decode(self.organization.pk, "qr.png", "hash", b"")
+        self.organization.refresh_from_db()
+
+    def broken_executor(self):
+        return mock.Mock(submit=mock.Mock(side_effect=BrokenProcessPool("died")))
+
+    def test_broken_pool_is_replaced(self):
+        broken, working = self.broken_executor(), mock.Mock()
+
+        with mock.patch.object(services, "qr_executor", broken):
+            self.submit(broken, working)
+            self.assertIsNone(services.qr_executor)
+
+        broken.shutdown.assert_called_once()
+        working.submit.return_value.add_done_callback.assert_called_once()
+        self.assertEqual(self.organization.kpay_qr_status, KpayQrStatus.PENDING)
+
+    def test_failed_submit_marks_the_qr_failed(self):
+        with self.assertLogs("organizations.services", level="ERROR"):
+            self.submit(self.broken_executor(), self.broken_executor())
+
+        self.assertEqual(self.organization.kpay_qr_status, KpayQrStatus.FAILED)
+
+
+class OrganizationAnalyticsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.org_admin = User.objects.create(username="orgadmin")
+        request = OrganizationRequest.objects.create(
+            submitted_by=cls.org_admin, organization_name="Relief", type="ngo"
+        )
+        cls.organization = Organization.objects.create(
+            admin=cls.org_admin, name="Relief", type="ngo", organization_request=request
+        )
+        cls.url = f"/api/organizations/{cls.organization.pk}/analytics/"
+
+    def get_as(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client.get(self.url)
+
+    def test_organization_admin_can_read_analytics(self):
+        response = self.get_as(self.org_admin)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["interval"], "day")
+
+    def test_staff_can_read_analytics(self):
+        staff = User.objects.create(username="staff", is_staff=True)
+
+        self.assertEqual(self.get_as(staff).status_code, 200)
+
+    def test_other_users_cannot_read_analytics(self):
+        stranger = User.objects.create(username="stranger")
+
+        self.assertEqual(self.get_as(stranger).status_code, 403)
+
+
+class OrganizationQueryBudgetTests(OrganizationTestCase):
+    def test_actions_stay_within_their_budget(self):
+        organization = Organization.objects.get(name="relief")
+        for actions, kwargs in [
+            ({"get": "list"}, {}),
+            ({"get": "retrieve"}, {"pk": organization.pk}),
+            ({"get": "top_donors"}, {"pk": organization.pk}),
+            ({"get": "analytics"}, {"pk": organization.pk}),
+        ]:
+            with self.subTest(actions["get"]):
+                response = assertMaxQueries(
+                    OrganizationViewSet.as_view(actions), user=self.admin, **kwargs
+                )
+                self.assertEqual(response.status_code, 200)
@@ -1,15 +1,38 @@
+import io
+
 from PIL import Image
 from pyzbar.pyzbar import decode
 
+# Longest side QR codes are decoded at, phone photos are several times larger
+QR_DECODE_MAX_SIZE = 1024
+
 
-def extract_qr_url(file):
+def decode_qr_image(data, max_size=QR_DECODE_MAX_SIZE):
+    """
+    Decode the first QR code in the image bytes `data`, on a grayscale copy
+    downscaled to `max_size`. Falls back to the larger decoded image when
+    nothing is found in the small one. Runs in the QR worker processes, so it must not
+    touch Django.
+    """
     try:
-        image = Image.open(file).convert("RGB")
+        with Image.open(io.BytesIO(data)) as image:
+            # Lets the JPEG decoder skip most of the work for large photos
+            image.draft("L", (max_size, max_size))
+            image = image.convert("L")
+    except (OSError, ValueError, Image.DecompressionBombError):
+        # Not an image Pillow can read
+        return None
+
+    small = image
+    if max(image.size) > max_size:
+        small = image.copy()
+        small.thumbnail((max_size, max_size), Image.Resampling.BILINEAR)
+
+    qr_data = decode(small)
+    if not qr_data and small is not image:
         qr_data = decode(image)
 
-        if qr_data:
-            return qr_data[0].data.decode("utf-8")
-        else:
-            return None
-    except Exception as e:
+    if qr_data:
+        return qr_data[0].data.decode("utf-8")
+    else:
         return None
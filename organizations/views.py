@@ -2,6 +2,7 @@ from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, status, viewsets
+from rest_framework.decorators import action
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
@@ -9,9 +10,17 @@ from rest_framework.response import Response
 from attachments.models import Attachment
 from chat.models import Chat
 from chat.serializers import ChatSerializer
+from core.views import QueryBudgetMixin, ReplicaReadMixin
+from search.filters import IndexedSearchFilter
+from transactions.serializers import (
+    DonorTotalSerializer,
+    TransactionSeriesQuerySerializer,
+    TransactionSeriesSerializer,
+)
+from transactions.services import get_top_donors, get_transaction_series
 
 from .models import Organization, OrganizationRequest
-from .permissions import IsAdminOrOrgAdmin, IsOrgAdmin
+from .permissions import IsAdminOrOrgAdmin, IsAdminOrOwnOrgAdmin, IsOrgAdmin
 from .serializers import (
     CreateOrganizationRequestSerializer,
     OrganizationRequestSerializer,
@@ -22,7 +31,11 @@ from .serializers import (
 
 class OrganizationRequestViewSet(viewsets.ModelViewSet):
     parser_classes = [MultiPartParser, FormParser]
-    queryset = OrganizationRequest.objects.all().order_by("-created_at")
+    queryset = (
+        OrganizationRequest.objects.select_related("submitted_by", "approved_by")
+        .with_attachments()
+        .order_by("-created_at")
+    )
     serializer_class = OrganizationRequestSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]
     filter_backend = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -49,21 +62,71 @@ class OrganizationRequestViewSet(viewsets.ModelViewSet):
         serializer.save(approved_by=self.request.user, approved_at=timezone.now())
 
 
-class OrganizationViewSet(viewsets.ModelViewSet):
-    queryset = Organization.objects.all().order_by("-created_at")
+class OrganizationViewSet(QueryBudgetMixin, ReplicaReadMixin, viewsets.ModelViewSet):
+    queryset = (
+        Organization.objects.select_related(
+            "ledger",
+            "admin",
+            "organization_request__submitted_by",
+            "organization_request__approved_by",
+        )
+        .with_attachments("organization_request")
+        .order_by("-created_at")
+    )
     serializer_class = OrganizationSerializer
     permission_classes = [IsAuthenticated, IsAdminOrOrgAdmin]
     http_method_names = ["get", "put", "patch", "delete"]
+    query_budget = {"list": 8, "retrieve": 6, "default": 12}
 
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
+        IndexedSearchFilter,
         filters.OrderingFilter,
     ]
     filterset_fields = ["admin__username", "organization_request__status"]
     search_fields = ["name"]
     ordering_fields = ["created_at", "name"]
 
+    # Top donors by approved donation total, ?limit= (default 10, at most 100)
+    @action(detail=True, methods=["get"], url_path="top-donors")
+    def top_donors(self, request, pk=None):
+        get_object_or_404(Organization.objects.only("id"), pk=pk)
+        donor_totals = get_top_donors(pk, limit=request.query_params.get("limit"))
+        return Response(DonorTotalSerializer(donor_totals, many=True).data)
+
+    # Donation and disbursement totals over time, read from the daily rollups.
+    # ?interval=day|week|month&start=&end= (dates), optional ?event= and
+    # ?status= (approved by default)
+    # Only for staff and the organization's admin
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="analytics",
+        permission_classes=[IsAuthenticated, IsAdminOrOwnOrgAdmin],
+    )
+    def analytics(self, request, pk=None):
+        self.get_object()
+        query = TransactionSeriesQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        series = get_transaction_series(
+            pk,
+            params["interval"],
+            params["start"],
+            params["end"],
+            event_id=params.get("event"),
+            status=params["status"],
+        )
+        return Response(
+            {
+                "interval": params["interval"],
+                "start": params["start"],
+                "end": params["end"],
+                "results": TransactionSeriesSerializer(series, many=True).data,
+            }
+        )
+
     def perform_update(self, serializer):
         # Organization has more than one attachment in attachments field
         if serializer.validated_data.get("attachments"):
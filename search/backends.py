@@ -0,0 +1,148 @@
+import re
+
+from django.db import connection
+from django.db.models import Case, F, FloatField, Q, Value, When
+from django.db.models.expressions import RawSQL
+
+from .models import SearchDocument
+
+FTS_TABLE = "search_searchdocument_fts"
+# Relative weight of title matches over body matches
+TITLE_WEIGHT = 10.0
+# Columns search results render
+RESULT_FIELDS = ("kind", "object_id", "organization_id", "title", "updated_at")
+
+
+class SearchBackend:
+    """
+    Plain `icontains` matching, for databases without a full-text index.
+    Backends return `SearchDocument` querysets annotated with a `rank`.
+    """
+
+    def update_documents(self, documents):
+        pass
+
+    def search(self, term, kinds=None, limit=None):
+        documents = self.get_documents(kinds).filter(
+            Q(title__icontains=term) | Q(body__icontains=term)
+        )
+        return self.limit(documents.annotate(rank=Value(1.0)), limit)
+
+    def filter(self, term, kinds=None):
+        """Every document matching `term`, unranked and uncapped, for filtering"""
+        return self.search(term, kinds)
+
+    def get_documents(self, kinds=None):
+        documents = SearchDocument.objects.only(*RESULT_FIELDS)
+        if kinds:
+            documents = documents.filter(kind__in=kinds)
+        return documents
+
+    def limit(self, documents, limit):
+        documents = documents.order_by("-rank", "-updated_at")
+        return documents if limit is None else documents[:limit]
+
+
+class PostgresSearchBackend(SearchBackend):
+    """
+    Ranked full-text search over the GIN indexed `search_vector`, plus trigram
+    similarity on titles so misspelled and partial names still match.
+    """
+
+    # Language neutral, names and descriptions are not all English
+    config = "simple"
+
+    def update_documents(self, documents):
+        from django.contrib.postgres.search import SearchVector
+
+        documents.update(
+            search_vector=SearchVector("title", weight="A", config=self.config)
+            + SearchVector("body", weight="B", config=self.config)
+        )
+
+    def search(self, term, kinds=None, limit=None):
+        from django.contrib.postgres.search import (
+            SearchQuery,
+            SearchRank,
+            TrigramSimilarity,
+        )
+
+        query = SearchQuery(term, config=self.config, search_type="websearch")
+        documents = (
+            self.get_documents(kinds)
+            .annotate(
+                rank=SearchRank(F("search_vector"), query)
+                + TrigramSimilarity("title", term)
+            )
+            .filter(Q(search_vector=query) | Q(title__trigram_similar=term))
+        )
+        return self.limit(documents, limit)
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """
+    FTS5 search for local development and tests, ranked with bm25. Every term
+    is matched as a prefix, the way users type into a search box.
+    """
+
+    # Ranked searches rank at most this many matches
+    max_matches = 1000
+
+    def get_match_query(self, term):
+        return " ".join(f'"{token}"*' for token in re.findall(r"\w+", term))
+
+    def filter(self, term, kinds=None):
+        match = self.get_match_query(term)
+        if not match:
+            return SearchDocument.objects.none()
+
+        return self.get_documents(kinds).filter(
+            pk__in=RawSQL(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]
+            )
+        )
+
+    def search(self, term, kinds=None, limit=None):
+        match = self.get_match_query(term)
+        if not match:
+            return SearchDocument.objects.none()
+
+        sql = (
+            f"SELECT document.id, bm25({FTS_TABLE}, {TITLE_WEIGHT}, 1.0) AS score "
+            f"FROM {FTS_TABLE} JOIN search_searchdocument document "
+            f"ON document.id = {FTS_TABLE}.rowid WHERE {FTS_TABLE} MATCH %s"
+        )
+        params = [match]
+        if kinds:
+            sql += f" AND document.kind IN ({', '.join(['%s'] * len(kinds))})"
+            params.extend(kinds)
+        sql += " ORDER BY score LIMIT %s"
+        params.append(min(limit or self.max_matches, self.max_matches))
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            # bm25 scores are negative, lower is better
+            ranks = {id: -score for id, score in cursor.fetchall()}
+
+        if not ranks:
+            return SearchDocument.objects.none()
+
+        documents = (
+            self.get_documents()
+            .filter(pk__in=ranks)
+            .annotate(
+                rank=Case(
+                    *(When(pk=id, then=Value(rank)) for id, rank in ranks.items()),
+                    output_field=FloatField(),
+                )
+            )
+        )
+        return self.limit(documents, limit)
+
+
+def get_search_backend():
+    if connection.vendor == "postgresql":
+        return PostgresSearchBackend()
+    if connection.vendor == "sqlite":
+        return SQLiteSearchBackend()
+    return SearchBackend()
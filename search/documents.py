@@ -0,0 +1,109 @@
+from django.contrib.contenttypes.models import ContentType
+
+from activities.models import Activity
+from events.models import Event
+from organizations.models import Organization
+
+from .backends import get_search_backend
+from .models import SearchDocument
+
+# Indexed models: kind, title field and the fields concatenated into the body
+SEARCH_MODELS = {
+    Organization: ("organization", "name", ["type", "description", "additional_info"]),
+    Event: ("event", "title", ["description"]),
+    Activity: ("activity", "title", ["description", "location"]),
+}
+SEARCH_KINDS = {kind: model for model, (kind, _, _) in SEARCH_MODELS.items()}
+INDEX_BATCH_SIZE = 500
+
+
+def get_search_kind(model):
+    entry = SEARCH_MODELS.get(model)
+    return entry[0] if entry else None
+
+
+def get_organization_id(instance):
+    return (
+        instance.pk if isinstance(instance, Organization) else instance.organization_id
+    )
+
+
+def build_document(instance, content_type):
+    kind, title_field, body_fields = SEARCH_MODELS[type(instance)]
+    return SearchDocument(
+        content_type=content_type,
+        object_id=instance.pk,
+        kind=kind,
+        organization_id=get_organization_id(instance),
+        title=getattr(instance, title_field)[:255],
+        body="\n".join(
+            value
+            for value in (getattr(instance, field) for field in body_fields)
+            if value
+        ),
+    )
+
+
+def index_objects(instances):
+    """
+    Insert or refresh the search documents of `instances` (all of one indexed
+    model) with one upsert per batch.
+    """
+    if not instances:
+        return
+
+    model = type(instances[0])
+    content_type = ContentType.objects.get_for_model(model)
+    documents = [build_document(instance, content_type) for instance in instances]
+    SearchDocument.objects.bulk_create(
+        documents,
+        batch_size=INDEX_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=["content_type", "object_id"],
+        update_fields=["kind", "organization", "title", "body", "updated_at"],
+    )
+    get_search_backend().update_documents(
+        SearchDocument.objects.filter(
+            content_type=content_type,
+            object_id__in=[instance.pk for instance in instances],
+        )
+    )
+
+
+def remove_objects(model, ids):
+    SearchDocument.objects.filter(
+        content_type=ContentType.objects.get_for_model(model), object_id__in=ids
+    ).delete()
+
+
+def rebuild_search_index(models=None):
+    """
+    Re-index every object of the indexed models (or of `models`) and drop
+    documents whose object no longer exists. Returns the indexed counts.
+    """
+    counts = {}
+    for model in models or SEARCH_MODELS:
+        kind, title_field, body_fields = SEARCH_MODELS[model]
+        queryset = model.objects.only(
+            "id",
+            title_field,
+            *body_fields,
+            *([] if model is Organization else ["organization_id"]),
+        ).order_by("pk")
+
+        counts[kind] = 0
+        batch = []
+        for instance in queryset.iterator(chunk_size=INDEX_BATCH_SIZE):
+            batch.append(instance)
+            if len(batch) == INDEX_BATCH_SIZE:
+                index_objects(batch)
+                counts[kind] += len(batch)
+                batch = []
+        index_objects(batch)
+        counts[kind] += len(batch)
+
+        SearchDocument.objects.filter(
+            content_type=ContentType.objects.get_for_model(model)
+        ).exclude(object_id__in=model.objects.values("pk")).delete()
+
+    return counts
@@ -0,0 +1,27 @@
+from django.db.models import Q
+from rest_framework.filters import SearchFilter
+
+from .backends import get_search_backend
+from .documents import get_search_kind
+
+
+class IndexedSearchFilter(SearchFilter):
+    """
+    `SearchFilter` that also matches indexed models through the search index,
+    so `?search=` finds descriptions and (on PostgreSQL) misspelled names too.
+    The `search_fields` substring matches are kept, `?search=ound` still finds
+    "Foundation". Other models keep the default behaviour.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        kind = get_search_kind(queryset.model)
+        term = " ".join(self.get_search_terms(request))
+        if kind is None or not term:
+            return super().filter_queryset(request, queryset, view)
+
+        substring_matches = super().filter_queryset(request, queryset, view)
+        index_matches = get_search_backend().filter(term, kinds=[kind])
+        return queryset.filter(
+            Q(pk__in=substring_matches.values("pk"))
+            | Q(pk__in=index_matches.values("object_id"))
+        )
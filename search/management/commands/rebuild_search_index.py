@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from search.documents import SEARCH_KINDS, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the search index of organizations, events and activities."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--type",
+            action="append",
+            choices=list(SEARCH_KINDS),
+            default=[],
+            help="Only rebuild the given type (can be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        models = [SEARCH_KINDS[kind] for kind in options["type"]]
+        counts = rebuild_search_index(models)
+
+        for kind, count in counts.items():
+            self.stdout.write(
+                self.style.SUCCESS(f"✅ Indexed {count} {kind} documents")
+            )
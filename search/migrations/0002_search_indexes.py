@@ -0,0 +1,136 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+FTS_TABLE = "search_searchdocument_fts"
+
+POSTGRESQL_INDEXES = [
+    (
+        (
+            "CREATE INDEX search_document_vector_idx ON search_searchdocument "
+            "USING gin (search_vector)"
+        ),
+        "DROP INDEX IF EXISTS search_document_vector_idx",
+    ),
+    (
+        (
+            "CREATE INDEX search_document_title_trgm_idx ON search_searchdocument "
+            "USING gin (title gin_trgm_ops)"
+        ),
+        "DROP INDEX IF EXISTS search_document_title_trgm_idx",
+    ),
+]
+
+# External content FTS5 table over search_searchdocument, kept in sync by triggers
+SQLITE_INDEXES = [
+    (
+        (
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(title, body, "
+            "content='search_searchdocument', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2')"
+        ),
+        f"DROP TABLE IF EXISTS {FTS_TABLE}",
+    ),
+    (
+        (
+            f"CREATE TRIGGER {FTS_TABLE}_insert AFTER INSERT ON search_searchdocument BEGIN "
+            f"INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body); "
+            "END"
+        ),
+        f"DROP TRIGGER IF EXISTS {FTS_TABLE}_insert",
+    ),
+    (
+        (
+            f"CREATE TRIGGER {FTS_TABLE}_delete AFTER DELETE ON search_searchdocument BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) "
+            "VALUES ('delete', old.id, old.title, old.body); "
+            "END"
+        ),
+        f"DROP TRIGGER IF EXISTS {FTS_TABLE}_delete",
+    ),
+    (
+        (
+            f"CREATE TRIGGER {FTS_TABLE}_update AFTER UPDATE ON search_searchdocument BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) "
+            "VALUES ('delete', old.id, old.title, old.body); "
+            f"INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body); "
+            "END"
+        ),
+        f"DROP TRIGGER IF EXISTS {FTS_TABLE}_update",
+    ),
+]
+
+VENDOR_INDEXES = {"postgresql": POSTGRESQL_INDEXES, "sqlite": SQLITE_INDEXES}
+
+# Indexed models: kind, title field and body fields (as in search.documents)
+SEARCH_MODELS = [
+    (
+        "organizations",
+        "Organization",
+        "organization",
+        "name",
+        ["type", "description", "additional_info"],
+    ),
+    ("events", "Event", "event", "title", ["description"]),
+    ("activities", "Activity", "activity", "title", ["description", "location"]),
+]
+
+
+def create_indexes(apps, schema_editor):
+    for create_sql, _ in VENDOR_INDEXES.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(create_sql)
+
+
+def drop_indexes(apps, schema_editor):
+    for _, drop_sql in reversed(
+        VENDOR_INDEXES.get(schema_editor.connection.vendor, [])
+    ):
+        schema_editor.execute(drop_sql)
+
+
+def backfill_documents(apps, schema_editor):
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    SearchDocument = apps.get_model("search", "SearchDocument")
+
+    for app_label, model_name, kind, title_field, body_fields in SEARCH_MODELS:
+        model = apps.get_model(app_label, model_name)
+        content_type, _ = ContentType.objects.get_or_create(
+            app_label=app_label, model=model_name.lower()
+        )
+        documents = [
+            SearchDocument(
+                content_type=content_type,
+                object_id=instance.pk,
+                kind=kind,
+                organization_id=(
+                    instance.pk if kind == "organization" else instance.organization_id
+                ),
+                title=getattr(instance, title_field)[:255],
+                body="\n".join(
+                    filter(None, (getattr(instance, field) for field in body_fields))
+                ),
+            )
+            for instance in model.objects.iterator(chunk_size=1000)
+        ]
+        SearchDocument.objects.bulk_create(documents, batch_size=1000)
+
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "UPDATE search_searchdocument SET search_vector = "
+            "setweight(to_tsvector('simple', title), 'A') || "
+            "setweight(to_tsvector('simple', body), 'B')"
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("activities", "0002_activity_activities__created_07f32c_idx"),
+        ("events", "0003_event_events_even_status_0ecdcc_idx"),
+        ("search", "0001_initial"),
+    ]
+
+    operations = [
+        # Only runs on PostgreSQL
+        TrigramExtension(),
+        migrations.RunPython(create_indexes, drop_indexes),
+        migrations.RunPython(backfill_documents, migrations.RunPython.noop),
+    ]
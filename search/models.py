@@ -0,0 +1,41 @@
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """
+    Searchable text of an organization, event or activity, kept up to date by
+    signals. Searches hit this table's full-text index instead of scanning
+    the source tables with `LIKE '%term%'`.
+
+    On PostgreSQL `search_vector` is GIN indexed (and `title` trigram indexed),
+    on SQLite the text is mirrored into an FTS5 table by triggers instead.
+    """
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.UUIDField()
+    content_object = GenericForeignKey("content_type", "object_id")
+    # "organization", "event" or "activity", so results render without lookups
+    kind = models.CharField(max_length=20)
+    organization = models.ForeignKey(
+        "organizations.Organization", on_delete=models.CASCADE, related_name="+"
+    )
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.kind}: {self.title}"
+
+    class Meta:
+        verbose_name = "Search Document"
+        verbose_name_plural = "Search Documents"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content_type", "object_id"],
+                name="unique_search_document",
+            ),
+        ]
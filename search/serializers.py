@@ -0,0 +1,23 @@
+from rest_framework import serializers
+
+from .documents import SEARCH_KINDS
+from .models import SearchDocument
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(min_length=2, max_length=200)
+    type = serializers.ChoiceField(choices=list(SEARCH_KINDS), required=False)
+    limit = serializers.IntegerField(
+        min_value=1, max_value=50, default=20, required=False
+    )
+
+
+class SearchResultSerializer(serializers.ModelSerializer):
+    type = serializers.CharField(source="kind")
+    id = serializers.UUIDField(source="object_id")
+    organization = serializers.UUIDField(source="organization_id")
+    rank = serializers.FloatField()
+
+    class Meta:
+        model = SearchDocument
+        fields = ["type", "id", "organization", "title", "rank"]
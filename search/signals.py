@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from activities.models import Activity
+from events.models import Event
+from organizations.models import Organization
+
+from .documents import index_objects, remove_objects
+
+
+@receiver(post_save, sender=Organization)
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=Activity)
+def index_instance(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_objects([instance])
+
+
+@receiver(post_delete, sender=Organization)
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=Activity)
+def remove_instance(sender, instance, **kwargs):
+    remove_objects(sender, [instance.pk])
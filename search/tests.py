@@ -0,0 +1,49 @@
+from unittest import mock
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from organizations.models import Organization, OrganizationRequest
+
+from .backends import SQLiteSearchBackend
+
+
+class IndexedSearchFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create(username="admin", is_staff=True)
+        for name, description in [
+            ("Foundation", "Scholarships for students"),
+            ("Shelter", "Emergency housing after floods"),
+            ("Water", "Clean water wells"),
+        ]:
+            request = OrganizationRequest.objects.create(
+                submitted_by=cls.admin, organization_name=name, type="ngo"
+            )
+            Organization.objects.create(
+                admin=cls.admin,
+                name=name,
+                type="ngo",
+                description=description,
+                organization_request=request,
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def search(self, term):
+        response = self.client.get("/api/organizations/", {"search": term})
+        self.assertEqual(response.status_code, 200)
+        return sorted(item["name"] for item in response.data["results"])
+
+    def test_substring_of_a_search_field_matches(self):
+        self.assertEqual(self.search("ound"), ["foundation"])
+
+    def test_indexed_description_matches(self):
+        self.assertEqual(self.search("floods"), ["shelter"])
+
+    def test_filter_is_not_capped_like_ranked_search(self):
+        with mock.patch.object(SQLiteSearchBackend, "max_matches", 1):
+            self.assertEqual(self.search("ngo"), ["foundation", "shelter", "water"])
@@ -0,0 +1,28 @@
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .backends import get_search_backend
+from .serializers import SearchQuerySerializer, SearchResultSerializer
+
+
+# Organizations, events and activities matching ?q=, best matches first.
+# Optional ?type=organization|event|activity and ?limit= (default 20, at most 50)
+class SearchView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        query = SearchQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        kind = params.get("type")
+        documents = get_search_backend().search(
+            params["q"], kinds=[kind] if kind else None, limit=params["limit"]
+        )
+        return Response(
+            {
+                "query": params["q"],
+                "results": SearchResultSerializer(documents, many=True).data,
+            }
+        )
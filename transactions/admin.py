@@ -1,5 +1,6 @@
 from django.contrib import admin
 
-from .models import Transaction
+from .models import OrganizationLedger, Transaction
 
 admin.site.register(Transaction)
+admin.site.register(OrganizationLedger)
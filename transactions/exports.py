@@ -0,0 +1,59 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+# Column name -> lookup of the exported value
+EXPORT_FIELDS = {
+    "id": "id",
+    "created_at": "created_at",
+    "organization": "organization__name",
+    "event": "event__title",
+    "title": "title",
+    "amount": "amount",
+    "status": "status",
+}
+EXPORT_CHUNK_SIZE = 1000
+
+
+class Echo:
+    """
+    File-like object that hands every written line straight back to the caller,
+    so csv.writer can feed a streaming response
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_rows(queryset):
+    # values_list + iterator keeps memory flat no matter how long the history is
+    return queryset.values_list(*EXPORT_FIELDS.values()).iterator(
+        chunk_size=EXPORT_CHUNK_SIZE
+    )
+
+
+def iter_ndjson(queryset):
+    for row in iter_rows(queryset):
+        yield json.dumps(dict(zip(EXPORT_FIELDS, row)), cls=DjangoJSONEncoder) + "\n"
+
+
+def iter_csv(queryset):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in iter_rows(queryset):
+        yield writer.writerow(row)
+
+
+EXPORT_FORMATS = {
+    "ndjson": (iter_ndjson, "application/x-ndjson", "ndjson"),
+    "csv": (iter_csv, "text/csv", "csv"),
+}
+
+
+def stream_export(queryset, export_format, filename):
+    iter_content, content_type, extension = EXPORT_FORMATS[export_format]
+    response = StreamingHttpResponse(iter_content(queryset), content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{extension}"'
+    return response
@@ -0,0 +1,90 @@
+import re
+from uuid import uuid4
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from events.models import Event
+from organizations.models import Organization
+from transactions.constants import TransactionStatus, TransactionType
+from transactions.models import Transaction
+
+TABLE = Transaction._meta.db_table
+# Full table scans in EXPLAIN output, per database backend
+SEQUENTIAL_SCANS = {
+    "postgresql": re.compile(rf"Seq Scan on {TABLE}\b"),
+    "sqlite": re.compile(rf"\bSCAN {TABLE}\b"),
+}
+
+
+def get_hot_queries():
+    """
+    The transaction queries behind the busiest endpoints, built the way the
+    views build them. The ids only shape the plan, they need not exist.
+    """
+    organization_id, event_id, actor_id = uuid4(), uuid4(), uuid4()
+    donation = {"type": TransactionType.DONATION}
+    approved_donation = {**donation, "status": TransactionStatus.APPROVED}
+
+    return {
+        "organization transactions page": Transaction.objects.filter(
+            organization_id=organization_id
+        ).order_by("-created_at", "-id")[:8],
+        "organization transactions by type and status": Transaction.objects.filter(
+            organization_id=organization_id,
+            type=TransactionType.DISBURSEMENT,
+            status=TransactionStatus.PENDING,
+        ),
+        "organization stats": Organization.objects.filter(
+            pk=organization_id
+        ).with_stats(),
+        "donation history page": Transaction.objects.filter(
+            actor_id=actor_id, **donation
+        ).order_by("-created_at", "-id")[:8],
+        "event donations": Transaction.objects.filter(
+            event_id=event_id, **approved_donation
+        ),
+        "event progress": Event.objects.filter(pk=event_id).with_progress(),
+    }
+
+
+class Command(BaseCommand):
+    help = "EXPLAIN the hot transaction queries and fail if any of them scans the whole transaction table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--show-plans",
+            action="store_true",
+            help="Print the query plan of every query.",
+        )
+
+    def handle(self, *args, **options):
+        pattern = SEQUENTIAL_SCANS.get(connection.vendor)
+        if pattern is None:
+            raise CommandError(f"Query plans of {connection.vendor} are not supported")
+
+        failures = []
+        with transaction.atomic():
+            if connection.vendor == "postgresql":
+                # Small tables are cheaper to scan, only fall back to a scan
+                # when there is no usable index at all
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+
+            for name, queryset in get_hot_queries().items():
+                plan = queryset.explain()
+                if options["show_plans"]:
+                    self.stdout.write(f"{name}:\n{plan}\n")
+
+                if pattern.search(plan):
+                    failures.append(name)
+                    self.stdout.write(
+                        self.style.WARNING(f"⚠️ {name} scans the whole {TABLE} table")
+                    )
+                else:
+                    self.stdout.write(self.style.SUCCESS(f"✅ {name} uses an index"))
+
+        if failures:
+            raise CommandError(
+                f"{len(failures)} hot queries fall back to a sequential scan"
+            )
@@ -0,0 +1,80 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from organizations.models import Organization
+from transactions.services import (
+    LEDGER_TOTAL_FIELDS,
+    find_donor_total_mismatches,
+    find_ledger_mismatches,
+    find_rollup_mismatches,
+    rebuild_donor_totals,
+    rebuild_organization_ledgers,
+    rebuild_transaction_rollups,
+)
+
+
+class Command(BaseCommand):
+    help = "Rebuild organization ledgers, donor totals and daily rollups from the transaction table, or verify them with --verify."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Only compare the stored ledgers against the transaction table.",
+        )
+        parser.add_argument(
+            "--organization",
+            action="append",
+            default=[],
+            help="Limit to the given organization id (can be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        organizations = Organization.objects.all()
+        if options["organization"]:
+            organizations = organizations.filter(pk__in=options["organization"])
+
+        if options["verify"]:
+            mismatches = find_ledger_mismatches(organizations)
+            for expected in mismatches:
+                totals = ", ".join(
+                    f"{field}={getattr(expected, field)}"
+                    for field in LEDGER_TOTAL_FIELDS
+                )
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"⚠️ Ledger of '{expected.organization}' is out of date, expected {totals}"
+                    )
+                )
+
+            for name, find_mismatches in (
+                ("Donor totals", find_donor_total_mismatches),
+                ("Daily rollups", find_rollup_mismatches),
+            ):
+                for organization in find_mismatches(organizations):
+                    self.stdout.write(
+                        self.style.WARNING(
+                            f"⚠️ {name} of '{organization}' are out of date"
+                        )
+                    )
+                    mismatches.append(organization)
+
+            if mismatches:
+                raise CommandError(f"{len(mismatches)} ledger(s) or totals out of date")
+
+            self.stdout.write(
+                self.style.SUCCESS("✅ All ledgers match the transactions")
+            )
+            return
+
+        with transaction.atomic():
+            ledgers = rebuild_organization_ledgers(organizations)
+            donor_totals = rebuild_donor_totals(organizations)
+            rollups = rebuild_transaction_rollups(organizations)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Rebuilt {len(ledgers)} ledger(s), {len(donor_totals)} donor "
+                f"total(s) and {len(rollups)} daily rollup(s)"
+            )
+        )
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def backfill_ledgers(apps, schema_editor):
+    Organization = apps.get_model("organizations", "Organization")
+    OrganizationLedger = apps.get_model("transactions", "OrganizationLedger")
+
+    donation = Q(transactions__type="donation")
+    approved_donation = donation & Q(transactions__status="approved")
+    organizations = Organization.objects.annotate(
+        received=Sum("transactions__amount", filter=donation),
+        expense=Sum(
+            "transactions__amount", filter=Q(transactions__type="disbursement")
+        ),
+        donors=Count("transactions__actor", filter=approved_donation, distinct=True),
+        donations=Count("transactions", filter=approved_donation),
+    )
+    OrganizationLedger.objects.bulk_create(
+        OrganizationLedger(
+            organization=organization,
+            donation_total=organization.received or 0,
+            disbursement_total=organization.expense or 0,
+            donation_count=organization.donations,
+            donor_count=organization.donors,
+        )
+        for organization in organizations
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("organizations", "0003_organization_kpay_qr_image_and_more"),
+        ("transactions", "0006_rename_donor_transaction_actor"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OrganizationLedger",
+            fields=[
+                (
+                    "organization",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="ledger",
+                        serialize=False,
+                        to="organizations.organization",
+                    ),
+                ),
+                (
+                    "donation_total",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "disbursement_total",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                ("donation_count", models.PositiveIntegerField(default=0)),
+                ("donor_count", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Organization Ledger",
+                "verbose_name_plural": "Organization Ledgers",
+            },
+        ),
+        migrations.RunPython(backfill_ledgers, migrations.RunPython.noop),
+    ]
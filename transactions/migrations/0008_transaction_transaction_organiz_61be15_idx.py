@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0003_event_events_even_status_0ecdcc_idx"),
+        ("organizations", "0003_organization_kpay_qr_image_and_more"),
+        ("transactions", "0007_organizationledger"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["organization", "-created_at", "-id"],
+                name="transaction_organiz_61be15_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,120 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_donor_totals(apps, schema_editor):
+    Transaction = apps.get_model("transactions", "Transaction")
+    DonorTotal = apps.get_model("transactions", "DonorTotal")
+
+    donations = Transaction.objects.filter(
+        type="donation", status="approved"
+    ).order_by()
+    donor_totals = []
+    for group_by in (["organization", "actor"], ["organization", "event", "actor"]):
+        rows = donations.values(*group_by).annotate(
+            sum=Sum("amount"), count=Count("id")
+        )
+        if "event" in group_by:
+            rows = rows.filter(event__isnull=False)
+
+        donor_totals += [
+            DonorTotal(
+                organization_id=row["organization"],
+                event_id=row.get("event"),
+                donor_id=row["actor"],
+                total=row["sum"],
+                donation_count=row["count"],
+            )
+            for row in rows
+        ]
+
+    DonorTotal.objects.bulk_create(donor_totals, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0003_event_events_even_status_0ecdcc_idx"),
+        ("organizations", "0004_organization_kpay_qr_status"),
+        ("transactions", "0008_transaction_transaction_organiz_61be15_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DonorTotal",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "total",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                ("donation_count", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "donor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="donor_totals",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "event",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="donor_totals",
+                        to="events.event",
+                    ),
+                ),
+                (
+                    "organization",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="donor_totals",
+                        to="organizations.organization",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Donor Total",
+                "verbose_name_plural": "Donor Totals",
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("event__isnull", True)),
+                        fields=["organization", "-total"],
+                        name="organization_leaderboard_idx",
+                    ),
+                    models.Index(
+                        fields=["event", "-total"], name="event_leaderboard_idx"
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        condition=models.Q(("event__isnull", True)),
+                        fields=("organization", "donor"),
+                        name="unique_organization_donor_total",
+                    ),
+                    models.UniqueConstraint(
+                        condition=models.Q(("event__isnull", False)),
+                        fields=("event", "donor"),
+                        name="unique_event_donor_total",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_donor_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0003_event_events_even_status_0ecdcc_idx"),
+        ("organizations", "0004_organization_kpay_qr_status"),
+        ("transactions", "0010_transaction_rollup"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # New indexes first, the foreign key indexes they replace are dropped after
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["organization", "type", "status"],
+                name="transaction_organiz_ee01c0_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["actor", "type", "-created_at", "-id"],
+                name="transaction_actor_i_005280_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["event", "type", "status"],
+                name="transaction_event_i_f616be_idx",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="transaction",
+            name="actor",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="transactions",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="transaction",
+            name="event",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="transactions",
+                to="events.event",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="transaction",
+            name="organization",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="transactions",
+                to="organizations.organization",
+            ),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.conf import settings
 from django.core.validators import MinValueValidator
 from django.db import models
+from django.db import transaction as db_transaction
 
 from core.models import AttachableModel, BaseModel
 from events.models import Event
@@ -10,11 +11,19 @@ from .constants import TransactionStatus, TransactionType
 
 
 class Transaction(BaseModel, AttachableModel):
+    # The foreign keys lead the composite indexes below, which also serve
+    # single column lookups, so they get no index of their own
     organization = models.ForeignKey(
-        Organization, on_delete=models.CASCADE, related_name="transactions"
+        Organization,
+        on_delete=models.CASCADE,
+        related_name="transactions",
+        db_index=False,
     )
     actor = models.ForeignKey(
-        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="transactions"
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="transactions",
+        db_index=False,
     )
     event = models.ForeignKey(
         Event,
@@ -22,6 +31,7 @@ class Transaction(BaseModel, AttachableModel):
         null=True,
         blank=True,
         related_name="transactions",
+        db_index=False,
     )
     title = models.CharField(max_length=100, null=True, blank=True)
     amount = models.DecimalField(
@@ -39,6 +49,152 @@ class Transaction(BaseModel, AttachableModel):
         verbose_name = "Transaction"
         verbose_name_plural = "Transactions"
         ordering = ["-created_at"]
+        indexes = [
+            # Keyset pages of an organization's transactions
+            models.Index(fields=["organization", "-created_at", "-id"]),
+            # Organization stats, ledger rebuilds and ?type=&status= filters
+            models.Index(fields=["organization", "type", "status"]),
+            # Keyset pages of a donor's donation history
+            models.Index(fields=["actor", "type", "-created_at", "-id"]),
+            # Event progress and event donor totals
+            models.Index(fields=["event", "type", "status"]),
+        ]
 
     def __str__(self):
         return f"{self.actor.username} {self.amount} {self.type} {self.status} {self.created_at}"
+
+    def save(self, *args, **kwargs):
+        # Ledger signals must commit or roll back together with the row itself
+        with db_transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class OrganizationLedger(models.Model):
+    """
+    Running transaction totals of an organization, kept in sync by the
+    transaction signals so stats are read by primary key instead of being
+    aggregated over the whole transaction history.
+    """
+
+    organization = models.OneToOneField(
+        Organization,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="ledger",
+    )
+    donation_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    disbursement_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    donation_count = models.PositiveIntegerField(default=0)
+    donor_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Organization Ledger"
+        verbose_name_plural = "Organization Ledgers"
+
+    def __str__(self):
+        return f"{self.organization} ledger"
+
+
+class DonorTotal(models.Model):
+    """
+    Approved donation total of a donor to an organization (`event` is null) or
+    to one of its events, kept in sync by the transaction signals so
+    leaderboards read the top rows of an index instead of grouping the
+    transaction table.
+    """
+
+    organization = models.ForeignKey(
+        Organization, on_delete=models.CASCADE, related_name="donor_totals"
+    )
+    event = models.ForeignKey(
+        Event,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="donor_totals",
+    )
+    donor = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="donor_totals"
+    )
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    donation_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Donor Total"
+        verbose_name_plural = "Donor Totals"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["organization", "donor"],
+                condition=models.Q(event__isnull=True),
+                name="unique_organization_donor_total",
+            ),
+            models.UniqueConstraint(
+                fields=["event", "donor"],
+                condition=models.Q(event__isnull=False),
+                name="unique_event_donor_total",
+            ),
+        ]
+        indexes = [
+            # Leaderboards, the top donors of an organization or of an event
+            models.Index(
+                fields=["organization", "-total"],
+                condition=models.Q(event__isnull=True),
+                name="organization_leaderboard_idx",
+            ),
+            models.Index(fields=["event", "-total"], name="event_leaderboard_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.donor} {self.total} to {self.event or self.organization}"
+
+
+class TransactionRollup(models.Model):
+    """
+    Daily transaction totals of an organization per event, type and status,
+    kept in sync by the transaction signals so charts are grouped from a few
+    rows per day instead of the transaction table. Weeks and months are
+    summed from the days.
+    """
+
+    organization = models.ForeignKey(
+        Organization, on_delete=models.CASCADE, related_name="transaction_rollups"
+    )
+    event = models.ForeignKey(
+        Event,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="transaction_rollups",
+    )
+    type = models.CharField(max_length=20, choices=TransactionType.choices)
+    status = models.CharField(max_length=20, choices=TransactionStatus.choices)
+    bucket_start = models.DateField()
+    amount_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Transaction Rollup"
+        verbose_name_plural = "Transaction Rollups"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["organization", "type", "status", "bucket_start"],
+                condition=models.Q(event__isnull=True),
+                name="unique_organization_rollup",
+            ),
+            models.UniqueConstraint(
+                fields=["organization", "event", "type", "status", "bucket_start"],
+                condition=models.Q(event__isnull=False),
+                name="unique_event_rollup",
+            ),
+        ]
+        indexes = [
+            # Time series of an organization
+            models.Index(
+                fields=["organization", "bucket_start"], name="rollup_series_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.organization} {self.type} {self.status} {self.bucket_start}"
@@ -1,13 +1,17 @@
+from datetime import timedelta
+
 from django.db import transaction as db_transaction
+from django.utils import timezone
 from rest_framework import serializers
 
-from accounts.serializers import SimpleUserSerializer
+from accounts.serializers import PublicUserSerializer, SimpleUserSerializer
 from attachments.serializers import SimpleAttachmentSerializer
 from events.serializers import SimpleEventSerializer
 from organizations.serializers import SimpleOrganizationSerializer
 
 from .constants import TransactionStatus, TransactionType
-from .models import Transaction
+from .models import DonorTotal, Transaction
+from .services import ROLLUP_INTERVALS
 
 
 class TransactionSerializer(serializers.ModelSerializer):
@@ -164,3 +168,64 @@ class UpdateTransactionSerializer(serializers.ModelSerializer):
         # If the status is pending, we can update it
 
         return super().validate(attrs)
+
+
+class SimpleTransactionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Transaction
+        fields = ["id", "title", "amount", "type", "status", "created_at"]
+
+
+class DonorTotalSerializer(serializers.ModelSerializer):
+    # Leaderboards are public to every signed in user
+    donor = PublicUserSerializer(read_only=True)
+
+    class Meta:
+        model = DonorTotal
+        fields = ["donor", "total", "donation_count"]
+
+
+class TransactionSeriesSerializer(serializers.Serializer):
+    bucket = serializers.DateField()
+    donation_total = serializers.DecimalField(max_digits=14, decimal_places=2)
+    donation_count = serializers.IntegerField()
+    disbursement_total = serializers.DecimalField(max_digits=14, decimal_places=2)
+    disbursement_count = serializers.IntegerField()
+
+
+class TransactionSeriesQuerySerializer(serializers.Serializer):
+    # Buckets of the default range, ending today, and the most a request may ask for
+    DEFAULT_BUCKETS = {"day": 30, "week": 12, "month": 12}
+    MAX_BUCKETS = 400
+    BUCKET_DAYS = {"day": 1, "week": 7, "month": 31}
+
+    interval = serializers.ChoiceField(
+        choices=list(ROLLUP_INTERVALS), default="day", required=False
+    )
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    event = serializers.UUIDField(required=False)
+    status = serializers.ChoiceField(
+        choices=TransactionStatus.choices,
+        default=TransactionStatus.APPROVED,
+        required=False,
+    )
+
+    def validate(self, attrs):
+        interval = attrs.setdefault("interval", "day")
+        end = attrs.setdefault("end", timezone.localdate())
+        bucket_days = self.BUCKET_DAYS[interval]
+        start = attrs.setdefault(
+            "start",
+            end - timedelta(days=bucket_days * (self.DEFAULT_BUCKETS[interval] - 1)),
+        )
+
+        if start > end:
+            raise serializers.ValidationError("start must be before end")
+
+        if (end - start).days > bucket_days * self.MAX_BUCKETS:
+            raise serializers.ValidationError(
+                f"At most {self.MAX_BUCKETS} {interval}s can be requested at once"
+            )
+
+        return attrs
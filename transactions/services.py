@@ -0,0 +1,458 @@
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import IntegrityError
+from django.db import transaction as db_transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .constants import TransactionStatus, TransactionType
+from .models import DonorTotal, OrganizationLedger, Transaction, TransactionRollup
+
+LEDGER_SOURCE_FIELDS = [
+    "organization_id",
+    "event_id",
+    "actor_id",
+    "type",
+    "status",
+    "amount",
+    "created_at",
+]
+LEADERBOARD_SIZE = 10
+LEADERBOARD_MAX_SIZE = 100
+LEDGER_TOTAL_FIELDS = [
+    "donation_total",
+    "disbursement_total",
+    "donation_count",
+    "donor_count",
+]
+
+
+def get_transaction_state(transaction):
+    """
+    Snapshot of the transaction fields the ledger, donor totals and rollups
+    depend on
+    """
+    return {field: getattr(transaction, field) for field in LEDGER_SOURCE_FIELDS}
+
+
+def is_approved_donation(state):
+    return (
+        state["type"] == TransactionType.DONATION
+        and state["status"] == TransactionStatus.APPROVED
+    )
+
+
+def update_organization_ledger(previous=None, current=None, donor_deltas=None):
+    """
+    Move the ledger from the `previous` state of a transaction to its `current`
+    state. `previous` is None on create and `current` is None on delete.
+    `donor_deltas` are the donor count changes by organization, as returned by
+    `update_donor_totals`.
+    """
+    deltas = defaultdict(lambda: defaultdict(int))
+
+    for state, sign in ((previous, -1), (current, 1)):
+        if state is None:
+            continue
+
+        organization_deltas = deltas[state["organization_id"]]
+        if state["type"] == TransactionType.DONATION:
+            organization_deltas["donation_total"] += sign * state["amount"]
+        else:
+            organization_deltas["disbursement_total"] += sign * state["amount"]
+
+        if is_approved_donation(state):
+            organization_deltas["donation_count"] += sign
+
+    for organization_id, donor_count in (donor_deltas or {}).items():
+        deltas[organization_id]["donor_count"] += donor_count
+
+    for organization_id, organization_deltas in deltas.items():
+        changes = {
+            field: F(field) + value
+            for field, value in organization_deltas.items()
+            if value
+        }
+        if not changes:
+            continue
+
+        ledger = OrganizationLedger.objects.filter(organization_id=organization_id)
+        if ledger.update(**changes) or current is None:
+            # Deletes never create a ledger, the organization may be going away too
+            continue
+
+        OrganizationLedger.objects.get_or_create(organization_id=organization_id)
+        ledger.update(**changes)
+
+
+def compute_organization_ledgers(organizations):
+    """
+    Compute the expected ledgers of the given organizations from the raw
+    transaction table, in one grouped query.
+    """
+    return [
+        OrganizationLedger(
+            organization=organization,
+            donation_total=organization.stats_received or 0,
+            disbursement_total=organization.stats_expense or 0,
+            donation_count=organization.stats_donations,
+            donor_count=organization.stats_donors,
+        )
+        for organization in organizations.with_stats()
+    ]
+
+
+def find_ledger_mismatches(organizations):
+    """
+    Return the expected ledgers whose stored row is missing or out of date
+    """
+    expected_ledgers = compute_organization_ledgers(organizations)
+    stored_ledgers = OrganizationLedger.objects.in_bulk(
+        [ledger.organization_id for ledger in expected_ledgers]
+    )
+
+    mismatches = []
+    for expected in expected_ledgers:
+        stored = stored_ledgers.get(expected.organization_id)
+        if stored is None or any(
+            getattr(stored, field) != getattr(expected, field)
+            for field in LEDGER_TOTAL_FIELDS
+        ):
+            mismatches.append(expected)
+
+    return mismatches
+
+
+def rebuild_organization_ledgers(organizations):
+    """
+    Overwrite the ledgers of the given organizations with freshly computed totals
+    """
+    ledgers = compute_organization_ledgers(organizations)
+    OrganizationLedger.objects.bulk_create(
+        ledgers,
+        update_conflicts=True,
+        unique_fields=["organization"],
+        update_fields=LEDGER_TOTAL_FIELDS,
+    )
+    return ledgers
+
+
+def update_donor_totals(previous=None, current=None):
+    """
+    Move the donor totals from the `previous` state of a transaction to its
+    `current` state, only approved donations count. Returns the change in the
+    number of donors by organization.
+    """
+    deltas = defaultdict(lambda: [0, 0])
+    donor_deltas = defaultdict(int)
+
+    for state, sign in ((previous, -1), (current, 1)):
+        if state is None or not is_approved_donation(state):
+            continue
+
+        # Every donation counts for its organization and for its event, if any
+        for event_id in {None, state["event_id"]}:
+            key = (state["organization_id"], event_id, state["actor_id"])
+            deltas[key][0] += sign * state["amount"]
+            deltas[key][1] += sign
+
+    for (organization_id, event_id, donor_id), (amount, count) in deltas.items():
+        if not amount and not count:
+            continue
+
+        # Donors without approved donations leave the leaderboard
+        change = apply_total_delta(
+            DonorTotal,
+            {
+                "organization_id": organization_id,
+                "event_id": event_id,
+                "donor_id": donor_id,
+            },
+            amount,
+            count,
+            amount_field="total",
+            count_field="donation_count",
+        )
+        # The organization wide row exists while the donor has approved
+        # donations. Its creation and deletion are decided under the row lock
+        # of the UPDATE, so concurrent first donations count the donor once
+        if event_id is None and change:
+            donor_deltas[organization_id] += change
+
+    return donor_deltas
+
+
+def apply_total_delta(model, lookup, amount, count, amount_field, count_field):
+    """
+    Add `amount` and `count` to the row of `model` matching `lookup`. The row
+    is created on its first addition and deleted once its count is back to 0.
+    Returns 1 when the row was created, -1 when it was deleted, 0 otherwise.
+    """
+    rows = model.objects.filter(**lookup)
+    changes = {
+        amount_field: F(amount_field) + amount,
+        count_field: F(count_field) + count,
+    }
+    if rows.update(**changes):
+        if count < 0:
+            deleted, _ = rows.filter(**{count_field: 0}).delete()
+            return -1 if deleted else 0
+        return 0
+
+    if count <= 0:
+        return 0
+
+    try:
+        with db_transaction.atomic():
+            model.objects.create(**lookup, **{amount_field: amount, count_field: count})
+    except IntegrityError:
+        # Created concurrently since the UPDATE above
+        rows.update(**changes)
+        return 0
+    return 1
+
+
+def get_top_donors(organization_id, event_id=None, limit=None):
+    """
+    Top donors of an organization, or of one of its events, by approved
+    donation total. `limit` is clamped to LEADERBOARD_MAX_SIZE.
+    """
+    try:
+        limit = max(1, min(int(limit), LEADERBOARD_MAX_SIZE))
+    except (TypeError, ValueError):
+        limit = LEADERBOARD_SIZE
+
+    return (
+        DonorTotal.objects.filter(organization_id=organization_id, event_id=event_id)
+        .select_related("donor__profile")
+        .order_by("-total", "donor_id")[:limit]
+    )
+
+
+def compute_donor_totals(organizations):
+    """
+    Compute the expected donor totals of the given organizations from the raw
+    transaction table, per organization and per event
+    """
+    donations = Transaction.objects.filter(
+        organization__in=organizations,
+        type=TransactionType.DONATION,
+        status=TransactionStatus.APPROVED,
+    ).order_by()
+
+    donor_totals = []
+    for group_by in (["organization", "actor"], ["organization", "event", "actor"]):
+        rows = donations.values(*group_by).annotate(
+            sum=Sum("amount"), count=Count("id")
+        )
+        if "event" in group_by:
+            rows = rows.filter(event__isnull=False)
+
+        donor_totals += [
+            DonorTotal(
+                organization_id=row["organization"],
+                event_id=row.get("event"),
+                donor_id=row["actor"],
+                total=row["sum"],
+                donation_count=row["count"],
+            )
+            for row in rows
+        ]
+
+    return donor_totals
+
+
+def find_row_mismatches(organizations, model, expected_rows, fields):
+    """
+    Return the organizations whose stored `model` rows differ from
+    `expected_rows` on any of `fields`
+    """
+    expected = defaultdict(set)
+    for row in expected_rows:
+        expected[row.organization_id].add(tuple(getattr(row, f) for f in fields))
+
+    stored = defaultdict(set)
+    for row in model.objects.filter(organization__in=organizations):
+        stored[row.organization_id].add(tuple(getattr(row, f) for f in fields))
+
+    return [
+        organization
+        for organization in organizations
+        if expected[organization.pk] != stored[organization.pk]
+    ]
+
+
+def find_donor_total_mismatches(organizations):
+    return find_row_mismatches(
+        organizations,
+        DonorTotal,
+        compute_donor_totals(organizations),
+        ["event_id", "donor_id", "total", "donation_count"],
+    )
+
+
+def rebuild_donor_totals(organizations):
+    """
+    Replace the donor totals of the given organizations with freshly computed ones
+    """
+    donor_totals = compute_donor_totals(organizations)
+    DonorTotal.objects.filter(organization__in=organizations).delete()
+    DonorTotal.objects.bulk_create(donor_totals, batch_size=1000)
+    return donor_totals
+
+
+ROLLUP_INTERVALS = {"day": None, "week": TruncWeek, "month": TruncMonth}
+
+
+def update_transaction_rollups(previous=None, current=None):
+    """
+    Move the daily rollups from the `previous` state of a transaction to its
+    `current` state
+    """
+    deltas = defaultdict(lambda: [0, 0])
+
+    for state, sign in ((previous, -1), (current, 1)):
+        if state is None:
+            continue
+
+        key = (
+            state["organization_id"],
+            state["event_id"],
+            state["type"],
+            state["status"],
+            timezone.localdate(state["created_at"]),
+        )
+        deltas[key][0] += sign * state["amount"]
+        deltas[key][1] += sign
+
+    for key, (amount, count) in deltas.items():
+        if not amount and not count:
+            continue
+
+        organization_id, event_id, type, status, bucket_start = key
+        apply_total_delta(
+            TransactionRollup,
+            {
+                "organization_id": organization_id,
+                "event_id": event_id,
+                "type": type,
+                "status": status,
+                "bucket_start": bucket_start,
+            },
+            amount,
+            count,
+            amount_field="amount_total",
+            count_field="count",
+        )
+
+
+def compute_transaction_rollups(organizations):
+    """
+    Compute the expected daily rollups of the given organizations from the raw
+    transaction table
+    """
+    rows = (
+        Transaction.objects.filter(organization__in=organizations)
+        .order_by()
+        .annotate(bucket_start=TruncDate("created_at"))
+        .values("organization", "event", "type", "status", "bucket_start")
+        .annotate(amount_total=Sum("amount"), count=Count("id"))
+    )
+
+    return [
+        TransactionRollup(
+            organization_id=row["organization"],
+            event_id=row["event"],
+            type=row["type"],
+            status=row["status"],
+            bucket_start=row["bucket_start"],
+            amount_total=row["amount_total"],
+            count=row["count"],
+        )
+        for row in rows
+    ]
+
+
+def find_rollup_mismatches(organizations):
+    return find_row_mismatches(
+        organizations,
+        TransactionRollup,
+        compute_transaction_rollups(organizations),
+        ["event_id", "type", "status", "bucket_start", "amount_total", "count"],
+    )
+
+
+def rebuild_transaction_rollups(organizations):
+    """
+    Replace the daily rollups of the given organizations with freshly computed ones
+    """
+    rollups = compute_transaction_rollups(organizations)
+    TransactionRollup.objects.filter(organization__in=organizations).delete()
+    TransactionRollup.objects.bulk_create(rollups, batch_size=1000)
+    return rollups
+
+
+def get_bucket_start(day, interval):
+    if interval == "week":
+        return day - timedelta(days=day.weekday())
+    if interval == "month":
+        return day.replace(day=1)
+    return day
+
+
+def get_next_bucket_start(bucket_start, interval):
+    if interval == "week":
+        return bucket_start + timedelta(days=7)
+    if interval == "month":
+        return (bucket_start + timedelta(days=32)).replace(day=1)
+    return bucket_start + timedelta(days=1)
+
+
+def get_transaction_series(
+    organization_id,
+    interval,
+    start,
+    end,
+    event_id=None,
+    status=TransactionStatus.APPROVED,
+):
+    """
+    Donation and disbursement totals of an organization per day, week or month
+    between `start` and `end`, read from the daily rollups. Buckets without
+    transactions are included with zero totals. Only approved transactions are
+    counted unless another `status` is given, `None` counts every status.
+    """
+    start = get_bucket_start(start, interval)
+    rollups = TransactionRollup.objects.filter(
+        organization_id=organization_id, bucket_start__range=(start, end)
+    )
+    if event_id is not None:
+        rollups = rollups.filter(event_id=event_id)
+    if status is not None:
+        rollups = rollups.filter(status=status)
+
+    trunc = ROLLUP_INTERVALS[interval]
+    rows = (
+        rollups.order_by()
+        .annotate(bucket=trunc("bucket_start") if trunc else F("bucket_start"))
+        .values("bucket", "type")
+        .annotate(amount_total=Sum("amount_total"), count=Sum("count"))
+    )
+
+    series = {}
+    bucket_start = start
+    while bucket_start <= end:
+        series[bucket_start] = {"bucket": bucket_start}
+        for type in TransactionType.values:
+            series[bucket_start][f"{type}_total"] = Decimal("0.00")
+            series[bucket_start][f"{type}_count"] = 0
+        bucket_start = get_next_bucket_start(bucket_start, interval)
+
+    for row in rows:
+        series[row["bucket"]][f"{row['type']}_total"] = row["amount_total"]
+        series[row["bucket"]][f"{row['type']}_count"] = row["count"]
+
+    return list(series.values())
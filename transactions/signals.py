@@ -0,0 +1,51 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from organizations.models import Organization
+
+from .models import OrganizationLedger, Transaction
+from .services import (
+    LEDGER_SOURCE_FIELDS,
+    get_transaction_state,
+    update_donor_totals,
+    update_organization_ledger,
+    update_transaction_rollups,
+)
+
+
+# Every organization starts with an empty ledger
+@receiver(post_save, sender=Organization)
+def create_organization_ledger(sender, instance, created, **kwargs):
+    if created:
+        OrganizationLedger.objects.get_or_create(organization=instance)
+
+
+# Remember the stored state so post_save can apply only the difference
+@receiver(pre_save, sender=Transaction)
+def remember_previous_state(sender, instance, **kwargs):
+    instance._previous_state = None
+    if instance._state.adding:
+        return
+
+    instance._previous_state = (
+        Transaction.objects.filter(pk=instance.pk).values(*LEDGER_SOURCE_FIELDS).first()
+    )
+
+
+@receiver(post_save, sender=Transaction)
+def update_ledger_on_save(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_state", None)
+    current = get_transaction_state(instance)
+    donor_deltas = update_donor_totals(previous=previous, current=current)
+    update_organization_ledger(
+        previous=previous, current=current, donor_deltas=donor_deltas
+    )
+    update_transaction_rollups(previous=previous, current=current)
+
+
+@receiver(post_delete, sender=Transaction)
+def update_ledger_on_delete(sender, instance, **kwargs):
+    previous = get_transaction_state(instance)
+    donor_deltas = update_donor_totals(previous=previous)
+    update_organization_ledger(previous=previous, donor_deltas=donor_deltas)
+    update_transaction_rollups(previous=previous)
@@ -1 +1,303 @@
-# Create your tests here.
+import csv
+import json
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.signals import post_save
+from django.http import StreamingHttpResponse
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from core.testing import assertMaxQueries
+from events.models import Event
+from organizations.models import Organization, OrganizationRequest
+
+from .constants import TransactionStatus, TransactionType
+from .exports import EXPORT_FIELDS
+from .management.commands.check_query_plans import SEQUENTIAL_SCANS, get_hot_queries
+from .models import OrganizationLedger, Transaction
+from .views import TransactionHistoryView, TransactionViewSet
+
+
+class DonationTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        admin = User.objects.create(username="admin", email="admin@example.com")
+        request = OrganizationRequest.objects.create(
+            submitted_by=admin, organization_name="Relief", type="ngo"
+        )
+        cls.organization = Organization.objects.create(
+            admin=admin, name="Relief", type="ngo", organization_request=request
+        )
+        cls.event = Event.objects.create(
+            organization=cls.organization,
+            title="Flood",
+            description="Flood relief",
+            target_amount=1000,
+            start_date=timezone.now(),
+            end_date=timezone.now() + timedelta(days=7),
+        )
+        donor = User.objects.create(username="donor", email="secret@example.com")
+        Transaction.objects.create(
+            organization=cls.organization,
+            event=cls.event,
+            actor=donor,
+            amount=Decimal("25.00"),
+            type=TransactionType.DONATION,
+            status=TransactionStatus.APPROVED,
+        )
+        cls.stranger = User.objects.create(username="stranger")
+
+
+class TopDonorsTests(DonationTestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.stranger)
+
+    def assert_no_contact_details(self, url):
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)
+        donor = response.data[0]["donor"]
+        self.assertEqual(donor["username"], "donor")
+        self.assertNotIn("email", donor)
+        self.assertNotIn("secret@example.com", response.content.decode())
+
+    def test_organization_leaderboard_hides_emails(self):
+        self.assert_no_contact_details(
+            f"/api/organizations/{self.organization.pk}/top-donors/"
+        )
+
+    def test_event_leaderboard_hides_emails(self):
+        self.assert_no_contact_details(
+            f"/api/organizations/{self.organization.pk}/events/{self.event.pk}/top-donors/"
+        )
+
+
+class DonationExportTests(DonationTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.donor = User.objects.get(username="donor")
+        request = OrganizationRequest.objects.create(
+            submitted_by=cls.stranger, organization_name="Shelter", type="ngo"
+        )
+        cls.shelter = Organization.objects.create(
+            admin=cls.stranger, name="Shelter", type="ngo", organization_request=request
+        )
+        for actor in [cls.donor, cls.stranger]:
+            Transaction.objects.create(
+                organization=cls.shelter,
+                actor=actor,
+                amount=Decimal("10.00"),
+                type=TransactionType.DONATION,
+                status=TransactionStatus.PENDING,
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.donor)
+
+    def export(self, export_format, content_type, **params):
+        response = self.client.get(
+            "/api/transactions/history/", {"export": export_format, **params}
+        )
+
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertEqual(response["Content-Type"], content_type)
+        self.assertIn(
+            f'filename="donation-history.{export_format}"',
+            response["Content-Disposition"],
+        )
+        return b"".join(response.streaming_content).decode().splitlines()
+
+    def test_ndjson_export(self):
+        rows = [
+            json.loads(line) for line in self.export("ndjson", "application/x-ndjson")
+        ]
+
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(list(rows[0]), list(EXPORT_FIELDS))
+        self.assertEqual(
+            {(row["organization"], row["amount"]) for row in rows},
+            {("relief", "25.00"), ("shelter", "10.00")},
+        )
+
+    def test_csv_export(self):
+        header, *rows = csv.reader(self.export("csv", "text/csv"))
+
+        self.assertEqual(header, list(EXPORT_FIELDS))
+        self.assertEqual(
+            sorted(row[header.index("organization")] for row in rows),
+            ["relief", "shelter"],
+        )
+
+    def test_export_keeps_the_organization_filter(self):
+        for export_format, content_type in [
+            ("ndjson", "application/x-ndjson"),
+            ("csv", "text/csv"),
+        ]:
+            with self.subTest(export_format):
+                lines = self.export(
+                    export_format, content_type, organization=self.shelter.pk
+                )
+                self.assertEqual(len(lines), 1 if export_format == "ndjson" else 2)
+                self.assertIn("shelter", lines[-1])
+                self.assertNotIn("relief", "".join(lines))
+
+    def test_unknown_format_is_rejected(self):
+        response = self.client.get("/api/transactions/history/", {"export": "xlsx"})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("export", response.data)
+
+
+class TransactionSeriesTests(DonationTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for status in [TransactionStatus.PENDING, TransactionStatus.REJECTED]:
+            Transaction.objects.create(
+                organization=cls.organization,
+                event=cls.event,
+                actor=cls.stranger,
+                amount=Decimal("100.00"),
+                type=TransactionType.DONATION,
+                status=status,
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.organization.admin)
+
+    def get_totals(self, params=None):
+        response = self.client.get(
+            f"/api/organizations/{self.organization.pk}/analytics/", params
+        )
+        self.assertEqual(response.status_code, 200)
+        today = response.data["results"][-1]
+        return today["donation_total"], today["donation_count"]
+
+    def test_default_series_counts_approved_donations_only(self):
+        self.assertEqual(self.get_totals(), ("25.00", 1))
+
+    def test_series_of_another_status(self):
+        self.assertEqual(
+            self.get_totals({"status": TransactionStatus.PENDING}), ("100.00", 1)
+        )
+
+
+class LedgerDonorCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        admin = User.objects.create(username="admin")
+        request = OrganizationRequest.objects.create(
+            submitted_by=admin, organization_name="Relief", type="ngo"
+        )
+        cls.organization = Organization.objects.create(
+            admin=admin, name="Relief", type="ngo", organization_request=request
+        )
+        cls.donor = User.objects.create(username="donor")
+
+    def donation(self, **kwargs):
+        return Transaction(
+            organization=self.organization,
+            actor=self.donor,
+            amount=Decimal("10.00"),
+            type=TransactionType.DONATION,
+            status=TransactionStatus.APPROVED,
+            **kwargs,
+        )
+
+    def assert_ledger(self, donation_count, donor_count):
+        ledger = OrganizationLedger.objects.get(organization=self.organization)
+        self.assertEqual(ledger.donation_count, donation_count)
+        self.assertEqual(ledger.donor_count, donor_count)
+
+    def test_donor_is_counted_once(self):
+        first = self.donation()
+        first.save()
+        second = self.donation()
+        second.save()
+        self.assert_ledger(2, 1)
+
+        first.delete()
+        self.assert_ledger(1, 1)
+
+        second.status = TransactionStatus.REJECTED
+        second.save()
+        self.assert_ledger(0, 0)
+
+    def test_concurrent_first_donations_count_the_donor_once(self):
+        # Both rows are inserted before either ledger update runs, as with two
+        # requests saving a first donation at the same time
+        first, second = Transaction.objects.bulk_create(
+            [self.donation(), self.donation()]
+        )
+        for donation in (first, second):
+            post_save.send(Transaction, instance=donation, created=True)
+
+        self.assert_ledger(2, 1)
+
+
+class QueryPlanTests(TestCase):
+    def test_hot_queries_use_an_index(self):
+        pattern = SEQUENTIAL_SCANS[connection.vendor]
+
+        for name, queryset in get_hot_queries().items():
+            with self.subTest(name):
+                self.assertNotRegex(queryset.explain(), pattern)
+
+    def test_check_query_plans_command(self):
+        output = StringIO()
+
+        call_command("check_query_plans", stdout=output)
+
+        self.assertNotIn("scans the whole", output.getvalue())
+
+
+class TransactionQueryBudgetTests(DonationTestCase):
+    def setUp(self):
+        self.admin = self.organization.admin
+        self.donation = Transaction.objects.get(type=TransactionType.DONATION)
+        self.disbursement = Transaction.objects.create(
+            organization=self.organization,
+            actor=self.admin,
+            amount=Decimal("5.00"),
+            type=TransactionType.DISBURSEMENT,
+            status=TransactionStatus.PENDING,
+        )
+
+    def assert_within_budget(self, view, user, method="get", status=200, **kwargs):
+        response = assertMaxQueries(view, method=method, user=user, **kwargs)
+        self.assertEqual(response.status_code, status)
+
+    def test_organization_transactions_stay_within_their_budget(self):
+        kwargs = {"organization_id": self.organization.pk}
+
+        self.assert_within_budget(
+            TransactionViewSet.as_view({"get": "list"}), self.admin, **kwargs
+        )
+        self.assert_within_budget(
+            TransactionViewSet.as_view({"get": "retrieve"}),
+            self.admin,
+            pk=self.donation.pk,
+            **kwargs,
+        )
+        self.assert_within_budget(
+            TransactionViewSet.as_view({"delete": "destroy"}),
+            self.admin,
+            method="delete",
+            status=204,
+            pk=self.disbursement.pk,
+            **kwargs,
+        )
+
+    def test_donation_history_stays_within_its_budget(self):
+        self.assert_within_budget(TransactionHistoryView.as_view(), self.donation.actor)
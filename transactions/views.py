@@ -1,28 +1,28 @@
 from sched import Event
+
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import viewsets
+from rest_framework import generics, viewsets
 from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.response import Response
-from rest_framework.views import APIView
 
+from core.paginations import KeysetPagination
 from core.permissions import IsOrgAdmin
+from core.views import QueryBudgetMixin, ReplicaReadMixin
 from organizations.models import Organization
 
 from .constants import TransactionStatus, TransactionType
+from .exports import EXPORT_FORMATS, stream_export
 from .filters import TransactionFilter
 from .models import Transaction
 from .serializers import TransactionSerializer, UpdateTransactionSerializer
 
 
-class TransactionViewSet(viewsets.ModelViewSet):
-    queryset = (
-        Transaction.objects.all()
-        .select_related("organization", "actor", "event")
-        .prefetch_related("attachments")
-    )
+class TransactionViewSet(QueryBudgetMixin, ReplicaReadMixin, viewsets.ModelViewSet):
+    queryset = Transaction.objects.select_related(
+        "organization", "actor__profile", "event"
+    ).with_attachments("organization")
     serializer_class = TransactionSerializer
     filter_backends = [SearchFilter, DjangoFilterBackend]
     search_fields = ["title"]
@@ -30,6 +30,7 @@ class TransactionViewSet(viewsets.ModelViewSet):
     ordering_fields = ["created_at", "updated_at"]
     ordering = ["-created_at"]
     permission_classes = [IsAuthenticated, IsOrgAdmin]
+    query_budget = {"list": 7, "retrieve": 7, "default": 15}
 
     def get_permissions(self):
         # To create user can be org admin or donor
@@ -72,9 +73,7 @@ class TransactionViewSet(viewsets.ModelViewSet):
             event = get_object_or_404(Event, pk=request.data.get("event"))
 
         serializer.save(
-            organization=self.organization,
-            actor=self.request.user,
-            event=event
+            organization=self.organization, actor=self.request.user, event=event
         )
 
     def perform_destroy(self, instance):
@@ -87,12 +86,34 @@ class TransactionViewSet(viewsets.ModelViewSet):
         instance.delete()
 
 
-class TransactionHistoryView(APIView):
+class TransactionHistoryView(QueryBudgetMixin, ReplicaReadMixin, generics.ListAPIView):
+    serializer_class = TransactionSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    filterset_fields = ["organization"]
+    query_budget = 5
+
+    def get_queryset(self):
+        return (
+            Transaction.objects.filter(
+                actor=self.request.user, type=TransactionType.DONATION
+            )
+            .select_related("organization", "actor__profile", "event")
+            .with_attachments("organization")
+        )
+
+    def list(self, request, *args, **kwargs):
+        # ?export=ndjson|csv streams the whole history instead of one page
+        export_format = request.query_params.get("export")
+        if export_format is None:
+            return super().list(request, *args, **kwargs)
+
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError(
+                {"export": f"Choose one of: {', '.join(EXPORT_FORMATS)}"}
+            )
 
-    def get(self, request):
-        transactions = Transaction.objects.filter(
-            actor=request.user, type=TransactionType.DONATION
+        queryset = self.filter_queryset(self.get_queryset()).order_by(
+            "-created_at", "-id"
         )
-        serializer = TransactionSerializer(transactions, many=True)
-        return Response(serializer.data)
+        return stream_export(queryset, export_format, "donation-history")